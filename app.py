@@ -9,7 +9,7 @@ from __future__ import annotations
 import sys
 import site
 
-from utils.database import get_db
+from utils.database import ensure_admin_user, get_db_read
 
 # Ensure user site-packages is available (may be disabled when running as root/sudo)
 if not site.ENABLE_USER_SITE:
@@ -31,7 +31,7 @@ from config import VERSION, CHANGELOG, SHARED_OBSERVER_LOCATION_ENABLED
 from utils.dependencies import check_tool, check_all_dependencies, TOOL_DEPENDENCIES
 from utils.process import cleanup_stale_processes
 from utils.sdr import SDRFactory
-from utils.cleanup import DataStore, cleanup_manager
+from utils.cleanup import DataStore, PeriodicTask, cleanup_manager
 from utils.constants import (
     MAX_AIRCRAFT_AGE_SECONDS,
     MAX_WIFI_NETWORK_AGE_SECONDS,
@@ -40,6 +40,7 @@ from utils.constants import (
     MAX_DSC_MESSAGE_AGE_SECONDS,
     MAX_DEAUTH_ALERTS_AGE_SECONDS,
     MAX_GSM_AGE_SECONDS,
+    DB_MAINTENANCE_INTERVAL_SECONDS,
     QUEUE_MAX_SIZE,
 )
 import logging
@@ -330,8 +331,11 @@ def login():
         username = request.form.get('username')
         password = request.form.get('password')
         
+        # Seed the default admin account on first use
+        ensure_admin_user()
+
         # Connect to DB and find user
-        with get_db() as conn:
+        with get_db_read() as conn:
             cursor = conn.execute(
                 'SELECT password_hash, role FROM users WHERE username = ?',
                 (username,)
@@ -864,8 +868,11 @@ def main() -> None:
     cleanup_stale_processes()
 
     # Initialize database for settings storage
-    from utils.database import init_db
+    from utils.database import init_db, run_maintenance
     init_db()
+    cleanup_manager.register(
+        PeriodicTask(run_maintenance, DB_MAINTENANCE_INTERVAL_SECONDS, name='database')
+    )
 
     # Start automatic cleanup of stale data entries
     cleanup_manager.start()
@@ -19,11 +19,12 @@ from typing import Generator
 
 import requests
 
-from flask import Blueprint, jsonify, request, Response
+from flask import Blueprint, jsonify, request, Response, stream_with_context
 
 from utils.database import (
     create_agent, get_agent, get_agent_by_name, list_agents,
-    update_agent, delete_agent, store_push_payload, get_recent_payloads
+    update_agent, delete_agent, store_push_payloads_bulk, get_recent_payloads,
+    iter_recent_payloads
 )
 from utils.agent_client import (
     AgentClient, AgentHTTPError, AgentConnectionError, create_client_from_agent
@@ -592,6 +593,10 @@ def ingest_push_data():
         "received_at": "2024-01-15T10:30:00Z"
     }
 
+    A batch can be sent as {"agent_name": ..., "payloads": [{...}, ...]},
+    each item carrying scan_type/interface/payload/received_at; the batch is
+    stored in one transaction and answered with "payload_ids".
+
     Expected header:
         X-API-Key: shared-secret (if agent has api_key configured)
     """
@@ -615,33 +620,48 @@ def ingest_push_data():
             logger.warning(f"Invalid API key from agent {agent_name}")
             return jsonify({'status': 'error', 'message': 'Invalid API key'}), 401
 
-    # Store payload
+    batch = data.get('payloads')
+    if batch is not None and (
+        not isinstance(batch, list) or not all(isinstance(item, dict) for item in batch)
+    ):
+        return jsonify({'status': 'error', 'message': 'payloads must be a list of objects'}), 400
+    items = batch if batch is not None else [data]
+
+    # Store payload(s) in a single transaction
     try:
-        payload_id = store_push_payload(
-            agent_id=agent['id'],
-            scan_type=data.get('scan_type', 'unknown'),
-            payload=data.get('payload', {}),
-            interface=data.get('interface'),
-            received_at=data.get('received_at')
-        )
+        payload_ids = store_push_payloads_bulk(agent['id'], [
+            (
+                item.get('scan_type', 'unknown'),
+                item.get('interface'),
+                item.get('payload', {}),
+                item.get('received_at')
+            )
+            for item in items
+        ])
 
         # Emit to SSE stream
-        try:
-            agent_data_queue.put_nowait({
-                'type': 'agent_data',
-                'agent_id': agent['id'],
-                'agent_name': agent_name,
-                'scan_type': data.get('scan_type'),
-                'interface': data.get('interface'),
-                'payload': data.get('payload'),
-                'received_at': data.get('received_at') or datetime.now(timezone.utc).isoformat()
-            })
-        except queue.Full:
-            logger.warning("Agent data queue full, data may be lost")
-
+        for item in items:
+            try:
+                agent_data_queue.put_nowait({
+                    'type': 'agent_data',
+                    'agent_id': agent['id'],
+                    'agent_name': agent_name,
+                    'scan_type': item.get('scan_type'),
+                    'interface': item.get('interface'),
+                    'payload': item.get('payload'),
+                    'received_at': item.get('received_at') or datetime.now(timezone.utc).isoformat()
+                })
+            except queue.Full:
+                logger.warning("Agent data queue full, data may be lost")
+
+        if batch is not None:
+            return jsonify({
+                'status': 'accepted',
+                'payload_ids': payload_ids
+            }), 202
         return jsonify({
             'status': 'accepted',
-            'payload_id': payload_id
+            'payload_id': payload_ids[0]
         }), 202
 
     except Exception as e:
@@ -654,18 +674,49 @@ def get_payloads():
     """Get recent push payloads."""
     agent_id = request.args.get('agent_id', type=int)
     scan_type = request.args.get('scan_type')
-    limit = request.args.get('limit', 100, type=int)
+    limit = min(request.args.get('limit', 100, type=int), 1000)
+    # Keyset cursor from the previous page's next_cursor
+    before_received_at = request.args.get('before_received_at')
+    before_id = request.args.get('before_id', type=int)
+    # Listing views can skip payload bodies and get payload_size instead
+    include_payload = request.args.get('include_payload', 'true').lower() == 'true'
+
+    # ?format=jsonl streams one payload per line as rows are read
+    if request.args.get('format') == 'jsonl':
+        rows = iter_recent_payloads(
+            agent_id=agent_id,
+            scan_type=scan_type,
+            limit=limit,
+            before_received_at=before_received_at,
+            before_id=before_id,
+            include_payload=include_payload
+        )
+        return Response(
+            stream_with_context(json.dumps(row) + '\n' for row in rows),
+            mimetype='application/x-ndjson'
+        )
 
     payloads = get_recent_payloads(
         agent_id=agent_id,
         scan_type=scan_type,
-        limit=min(limit, 1000)
+        limit=limit,
+        before_received_at=before_received_at,
+        before_id=before_id,
+        include_payload=include_payload
     )
 
+    next_cursor = None
+    if payloads and len(payloads) == limit:
+        next_cursor = {
+            'before_received_at': payloads[-1]['received_at'],
+            'before_id': payloads[-1]['id']
+        }
+
     return jsonify({
         'status': 'success',
         'payloads': payloads,
-        'count': len(payloads)
+        'count': len(payloads),
+        'next_cursor': next_cursor
     })
 
 
@@ -30,6 +30,7 @@ from utils.constants import (
 from utils.database import (
     store_dsc_alert,
     get_dsc_alerts,
+    get_dsc_alerts_columnar,
     get_dsc_alert,
     acknowledge_dsc_alert,
     get_dsc_alert_summary,
@@ -523,28 +524,53 @@ def get_alerts_endpoint() -> Response:
     acknowledged = request.args.get('acknowledged')
     limit = min(int(request.args.get('limit', 50)), 200)
     offset = int(request.args.get('offset', 0))
+    # Keyset cursor from the previous page's pagination.next_cursor
+    before_received_at = request.args.get('before_received_at')
+    before_id = request.args.get('before_id', type=int)
 
     # Convert acknowledged param
     ack_filter = None
     if acknowledged is not None:
         ack_filter = acknowledged.lower() in ('true', '1', 'yes')
 
+    # ?layout=columns returns one list per field, for exports and analytics
+    if request.args.get('layout') == 'columns':
+        columns = get_dsc_alerts_columnar(
+            category=category,
+            acknowledged=ack_filter,
+            limit=limit,
+            offset=offset,
+            before_received_at=before_received_at,
+            before_id=before_id
+        )
+        return jsonify({'columns': columns, 'count': len(columns['id'])})
+
     alerts = get_dsc_alerts(
         category=category,
         acknowledged=ack_filter,
         limit=limit,
-        offset=offset
+        offset=offset,
+        before_received_at=before_received_at,
+        before_id=before_id
     )
 
     summary = get_dsc_alert_summary()
 
+    next_cursor = None
+    if alerts and len(alerts) == limit:
+        next_cursor = {
+            'before_received_at': alerts[-1]['received_at'],
+            'before_id': alerts[-1]['id']
+        }
+
     return jsonify({
         'alerts': alerts,
         'count': len(alerts),
         'summary': summary,
         'pagination': {
             'limit': limit,
-            'offset': offset
+            'offset': offset,
+            'next_cursor': next_cursor
         }
     })
 
@@ -23,7 +23,8 @@ from data.tscm_frequencies import (
     get_sweep_preset,
 )
 from utils.database import (
-    add_device_timeline_entry,
+    add_device_timeline_entries_bulk,
+    add_signal_readings_bulk,
     add_tscm_threat,
     acknowledge_tscm_threat,
     cleanup_old_timeline_entries,
@@ -1569,6 +1570,8 @@ def _run_sweep(
 
         last_timeline_write: dict[str, float] = {}
         timeline_bucket = getattr(timeline_manager, 'bucket_seconds', 30)
+        pending_timeline: list[dict] = []
+        pending_signals: list[tuple] = []
 
         def _maybe_store_timeline(
             identifier: str,
@@ -1582,6 +1585,14 @@ def _run_sweep(
                 return
 
             identifier_norm = identifier.upper() if isinstance(identifier, str) else str(identifier)
+            if rssi is not None:
+                # Every observation feeds signal history; the timeline is bucketed
+                pending_signals.append((protocol, identifier_norm, rssi, {
+                    name: value
+                    for name, value in (('channel', channel), ('frequency', frequency))
+                    if value is not None
+                }))
+
             key = f"{protocol}:{identifier_norm}"
             now_ts = time.time()
             last_ts = last_timeline_write.get(key)
@@ -1589,18 +1600,31 @@ def _run_sweep(
                 return
 
             last_timeline_write[key] = now_ts
+            pending_timeline.append({
+                'device_identifier': identifier_norm,
+                'protocol': protocol,
+                'sweep_id': _current_sweep_id,
+                'rssi': rssi,
+                'channel': channel,
+                'frequency': frequency,
+                'attributes': attributes,
+            })
+
+        def _flush_timeline() -> None:
+            # One transaction per sweep tick instead of one per observation
+            if pending_signals:
+                try:
+                    add_signal_readings_bulk(pending_signals)
+                except Exception as e:
+                    logger.debug(f"TSCM signal history store error: {e}")
+                pending_signals.clear()
+            if not pending_timeline:
+                return
             try:
-                add_device_timeline_entry(
-                    device_identifier=identifier_norm,
-                    protocol=protocol,
-                    sweep_id=_current_sweep_id,
-                    rssi=rssi,
-                    channel=channel,
-                    frequency=frequency,
-                    attributes=attributes
-                )
+                add_device_timeline_entries_bulk(pending_timeline)
             except Exception as e:
                 logger.debug(f"TSCM timeline store error: {e}")
+            pending_timeline.clear()
 
         # Collect and analyze data
         threats_found = 0
@@ -1892,6 +1916,8 @@ def _run_sweep(
                 except Exception as e:
                     logger.error(f"RF scan error: {e}")
 
+            _flush_timeline()
+
             # Update progress
             elapsed = time.time() - start_time
             progress = min(100, int((elapsed / duration) * 100))
@@ -3214,8 +3240,10 @@ def list_cases():
 
     status = request.args.get('status')
     limit = request.args.get('limit', 50, type=int)
+    # Case pickers can skip the metadata JSON they do not display
+    include_payload = request.args.get('include_payload', 'true').lower() == 'true'
 
-    cases = get_all_tscm_cases(status=status, limit=limit)
+    cases = get_all_tscm_cases(status=status, limit=limit, include_payload=include_payload)
 
     return jsonify({
         'status': 'success',
@@ -22,7 +22,7 @@ from utils.agent_client import (
 )
 from utils.database import (
     init_db, get_db_path, create_agent, get_agent, get_agent_by_name,
-    list_agents, update_agent, delete_agent, store_push_payload,
+    list_agents, update_agent, delete_agent, store_push_payload, store_push_payloads_bulk,
     get_recent_payloads, cleanup_old_payloads
 )
 
@@ -333,9 +333,7 @@ class TestDatabaseAgentCRUD:
         db_module.DB_DIR = tmp_path
 
         # Clear any existing connection
-        if hasattr(db_module._local, 'connection') and db_module._local.connection:
-            db_module._local.connection.close()
-            db_module._local.connection = None
+        db_module.close_db()
 
         # Initialize schema
         init_db()
@@ -343,9 +341,7 @@ class TestDatabaseAgentCRUD:
         yield
 
         # Cleanup
-        if hasattr(db_module._local, 'connection') and db_module._local.connection:
-            db_module._local.connection.close()
-            db_module._local.connection = None
+        db_module.close_db()
         db_module.DB_PATH = original_db_path
 
     def test_create_agent(self):
@@ -416,6 +412,25 @@ class TestDatabaseAgentCRUD:
         names = [a['name'] for a in agents]
         assert 'inactive-sensor' not in names
 
+    def test_list_agents_cache_invalidated_on_write(self):
+        """list_agents should reflect agent writes made within the cache TTL."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+        assert [a['name'] for a in list_agents()] == ['sensor-1']
+
+        update_agent(agent_id, is_active=False)
+        assert list_agents() == []
+
+        create_agent(name='sensor-2', base_url='http://localhost:8021')
+        assert [a['name'] for a in list_agents()] == ['sensor-2']
+
+    def test_list_agents_returns_copies(self):
+        """Annotating a listed agent should not leak into later calls."""
+        create_agent(name='sensor-1', base_url='http://localhost:8020')
+
+        list_agents()[0]['healthy'] = True
+
+        assert 'healthy' not in list_agents()[0]
+
     def test_update_agent(self):
         """update_agent should modify agent fields."""
         agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
@@ -466,6 +481,72 @@ class TestDatabaseAgentCRUD:
 
         assert result is True
         assert get_agent(agent_id) is None
+        assert get_recent_payloads(agent_id=agent_id) == []
+
+    def test_delete_agent_cascades_after_migration(self):
+        """init_db should rebuild a legacy push_payloads table to cascade deletes."""
+        import utils.database as db_module
+
+        agent_id = create_agent(name='legacy', base_url='http://localhost:8020')
+        with db_module.get_db() as conn:
+            conn.execute('DROP TABLE push_payloads')
+            conn.execute('''
+                CREATE TABLE push_payloads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    agent_id INTEGER NOT NULL,
+                    scan_type TEXT NOT NULL,
+                    interface TEXT,
+                    payload TEXT NOT NULL,
+                    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (agent_id) REFERENCES agents(id)
+                )
+            ''')
+            conn.execute(
+                'INSERT INTO push_payloads (agent_id, scan_type, payload) VALUES (?, ?, ?)',
+                (agent_id, 'sensor', '{"temp": 21}')
+            )
+            conn.execute('PRAGMA user_version = 0')
+
+        init_db()
+
+        assert get_recent_payloads(agent_id=agent_id)[0]['payload'] == {'temp': 21}
+        assert delete_agent(agent_id) is True
+        with db_module.get_db_read() as conn:
+            assert conn.execute('SELECT COUNT(*) FROM push_payloads').fetchone()[0] == 0
+
+    def test_push_payload_migration_drops_orphans(self):
+        """init_db should drop legacy payloads of deleted agents rather than fail."""
+        import utils.database as db_module
+
+        agent_id = create_agent(name='legacy', base_url='http://localhost:8020')
+        conn = db_module.get_connection()
+        # Orphans predate foreign key enforcement
+        conn.execute('PRAGMA foreign_keys = OFF')
+        with db_module.get_db():
+            conn.execute('DROP TABLE push_payloads')
+            conn.execute('''
+                CREATE TABLE push_payloads (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    agent_id INTEGER NOT NULL,
+                    scan_type TEXT NOT NULL,
+                    interface TEXT,
+                    payload TEXT NOT NULL,
+                    received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    FOREIGN KEY (agent_id) REFERENCES agents(id)
+                )
+            ''')
+            conn.executemany(
+                'INSERT INTO push_payloads (agent_id, scan_type, payload) VALUES (?, ?, ?)',
+                [(agent_id, 'sensor', '{"temp": 21}'), (agent_id + 1, 'sensor', '{}')]
+            )
+            conn.execute('PRAGMA user_version = 0')
+        conn.execute('PRAGMA foreign_keys = ON')
+
+        init_db()
+
+        with db_module.get_db_read() as conn:
+            rows = conn.execute('SELECT agent_id FROM push_payloads').fetchall()
+        assert [row['agent_id'] for row in rows] == [agent_id]
 
     def test_delete_agent_not_found(self):
         """delete_agent should return False for missing agent."""
@@ -490,17 +571,13 @@ class TestDatabasePayloads:
         db_module.DB_PATH = test_db_path
         db_module.DB_DIR = tmp_path
 
-        if hasattr(db_module._local, 'connection') and db_module._local.connection:
-            db_module._local.connection.close()
-            db_module._local.connection = None
+        db_module.close_db()
 
         init_db()
 
         yield
 
-        if hasattr(db_module._local, 'connection') and db_module._local.connection:
-            db_module._local.connection.close()
-            db_module._local.connection = None
+        db_module.close_db()
         db_module.DB_PATH = original_db_path
 
     def test_store_push_payload(self):
@@ -512,6 +589,21 @@ class TestDatabasePayloads:
 
         assert payload_id > 0
 
+    def test_store_push_payloads_bulk(self):
+        """store_push_payloads_bulk should insert all payloads and touch last_seen."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+
+        ids = store_push_payloads_bulk(agent_id, [
+            ('adsb', 'rtlsdr0', {'aircraft': []}, None),
+            ('wifi', None, {'networks': []}, '2024-01-15 10:30:00'),
+        ])
+
+        assert len(ids) == 2 and ids[0] < ids[1]
+        payloads = {p['id']: p for p in get_recent_payloads(agent_id=agent_id)}
+        assert payloads[ids[1]]['received_at'] == '2024-01-15 10:30:00'
+        assert payloads[ids[0]]['interface'] == 'rtlsdr0'
+        assert get_agent(agent_id)['last_seen'] is not None
+
     def test_get_recent_payloads(self):
         """get_recent_payloads should return stored payloads."""
         agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
@@ -548,6 +640,67 @@ class TestDatabasePayloads:
         payloads = get_recent_payloads(agent_id=agent_id, limit=5)
         assert len(payloads) == 5
 
+    def test_get_recent_payloads_keyset(self):
+        """get_recent_payloads should page with a (received_at, id) cursor."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+        ids = store_push_payloads_bulk(agent_id, [('sensor', None, {'i': i}, None) for i in range(5)])
+
+        first = get_recent_payloads(agent_id=agent_id, limit=3)
+        rest = get_recent_payloads(
+            agent_id=agent_id, limit=3,
+            before_received_at=first[-1]['received_at'], before_id=first[-1]['id']
+        )
+
+        assert [p['id'] for p in first] == ids[:1:-1]
+        assert [p['id'] for p in rest] == ids[1::-1]
+
+    def test_cleanup_old_payloads_in_batches(self):
+        """cleanup_old_payloads should remove every expired row across batches."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+        store_push_payloads_bulk(
+            agent_id, [('sensor', None, {'i': i}, '2020-01-01 00:00:00') for i in range(1201)]
+        )
+        store_push_payload(agent_id, 'sensor', {'i': 'fresh'})
+
+        assert cleanup_old_payloads(max_age_hours=24) == 1201
+        remaining = get_recent_payloads(agent_id=agent_id)
+        assert [p['payload'] for p in remaining] == [{'i': 'fresh'}]
+
+    def test_payloads_stored_compressed(self):
+        """Payloads should be stored as compressed BLOBs and read back intact."""
+        import utils.database as db_module
+
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+        payload = {'networks': [{'bssid': f'00:11:22:33:44:{i:02X}'} for i in range(50)]}
+        payload_id = store_push_payload(agent_id, 'wifi', payload)
+
+        with db_module.get_db() as conn:
+            stored = conn.execute(
+                'SELECT payload FROM push_payloads WHERE id = ?', (payload_id,)
+            ).fetchone()[0]
+            # A row written before compression, still stored as JSON text
+            conn.execute(
+                'INSERT INTO push_payloads (agent_id, scan_type, payload) VALUES (?, ?, ?)',
+                (agent_id, 'sensor', '{"temp": 21}')
+            )
+
+        assert isinstance(stored, bytes)
+        assert len(stored) < len(json.dumps(payload))
+        payloads = {p['scan_type']: p for p in get_recent_payloads(agent_id=agent_id)}
+        assert payloads['wifi']['payload'] == payload
+        assert payloads['sensor']['payload'] == {'temp': 21}
+
+    def test_get_recent_payloads_without_payload(self):
+        """include_payload=False should return sizes instead of bodies."""
+        agent_id = create_agent(name='sensor-1', base_url='http://localhost:8020')
+        store_push_payload(agent_id, 'adsb', {'aircraft': [{'icao': 'A'}]})
+
+        payloads = get_recent_payloads(agent_id=agent_id, include_payload=False)
+
+        assert 'payload' not in payloads[0]
+        assert payloads[0]['payload_size'] > 0
+        assert payloads[0]['agent_name'] == 'sensor-1'
+
 
 # =============================================================================
 # Integration Tests
@@ -33,17 +33,13 @@ def setup_db(tmp_path):
     db_module.DB_PATH = test_db_path
     db_module.DB_DIR = tmp_path
 
-    if hasattr(db_module._local, 'connection') and db_module._local.connection:
-        db_module._local.connection.close()
-        db_module._local.connection = None
+    db_module.close_db()
 
     init_db()
 
     yield
 
-    if hasattr(db_module._local, 'connection') and db_module._local.connection:
-        db_module._local.connection.close()
-        db_module._local.connection = None
+    db_module.close_db()
     db_module.DB_PATH = original_db_path
 
 
@@ -322,6 +318,34 @@ class TestPushIngestion:
         assert data['status'] == 'accepted'
         assert 'payload_id' in data
 
+    def test_ingest_batch(self, client, sample_agent):
+        """POST /controller/api/ingest should store a payload batch."""
+        payload = {
+            'agent_name': 'test-sensor',
+            'payloads': [
+                {'scan_type': 'adsb', 'payload': {'aircraft': []}},
+                {'scan_type': 'wifi', 'interface': 'wlan0', 'payload': {'networks': []},
+                 'received_at': '2024-01-15T10:30:00Z'},
+            ]
+        }
+
+        response = client.post('/controller/api/ingest',
+            json=payload,
+            headers={'X-API-Key': 'test-key'},
+            content_type='application/json'
+        )
+
+        assert response.status_code == 202
+        data = json.loads(response.data)
+        assert len(data['payload_ids']) == 2
+
+        response = client.post('/controller/api/ingest',
+            json={'agent_name': 'test-sensor', 'payloads': 'not-a-list'},
+            headers={'X-API-Key': 'test-key'},
+            content_type='application/json'
+        )
+        assert response.status_code == 400
+
     def test_ingest_unknown_agent(self, client):
         """POST /controller/api/ingest should reject unknown agent."""
         payload = {
@@ -407,6 +431,22 @@ class TestPushIngestion:
 
         assert all(p['scan_type'] == 'adsb' for p in data['payloads'])
 
+    def test_get_payloads_jsonl(self, client, sample_agent):
+        """GET /controller/api/payloads?format=jsonl should stream one payload per line."""
+        for i in range(2):
+            client.post('/controller/api/ingest',
+                json={'agent_name': 'test-sensor', 'scan_type': 'adsb', 'payload': {'n': i}},
+                headers={'X-API-Key': 'test-key'},
+                content_type='application/json'
+            )
+
+        response = client.get(f'/controller/api/payloads?agent_id={sample_agent}&format=jsonl')
+        assert response.status_code == 200
+        assert response.mimetype == 'application/x-ndjson'
+
+        rows = [json.loads(line) for line in response.data.decode().splitlines()]
+        assert [row['payload'] for row in rows] == [{'n': 1}, {'n': 0}]
+
 
 # =============================================================================
 # Location Estimation Tests
@@ -24,6 +24,159 @@ def temp_db():
             close_db()
 
 
+class TestConnectionPragmas:
+    """Tests for per-connection PRAGMA setup."""
+
+    def test_writer_uses_wal(self, temp_db):
+        """Test the writer runs in WAL mode with relaxed sync."""
+        from utils.database import get_connection
+
+        conn = get_connection()
+        assert conn.execute('PRAGMA journal_mode').fetchone()[0] == 'wal'
+        assert conn.execute('PRAGMA synchronous').fetchone()[0] == 1
+        assert conn.execute('PRAGMA foreign_keys').fetchone()[0] == 1
+
+    def test_unsafe_fast_writes_restores_sync(self, temp_db):
+        """Test synchronous is OFF inside the block and NORMAL again after."""
+        from utils.database import add_signal_readings_bulk, get_connection, unsafe_fast_writes
+
+        with unsafe_fast_writes() as conn:
+            assert conn.execute('PRAGMA synchronous').fetchone()[0] == 0
+            add_signal_readings_bulk([('wifi', 'AA:BB', -60, None)])
+
+        assert get_connection().execute('PRAGMA synchronous').fetchone()[0] == 1
+        count = get_connection().execute('SELECT COUNT(*) FROM signal_history').fetchone()[0]
+        assert count == 1
+
+    def test_reader_sees_wal_commits(self, temp_db):
+        """Test a reader observes data committed by the writer."""
+        from utils.database import get_read_connection, get_setting, set_setting
+
+        assert get_read_connection().execute('PRAGMA temp_store').fetchone()[0] == 2
+        set_setting('wal_key', 'value')
+        row = get_read_connection().execute(
+            "SELECT value FROM settings WHERE key = 'wal_key'"
+        ).fetchone()
+        assert row[0] == 'value'
+        assert get_setting('wal_key') == 'value'
+
+
+class TestSchemaInit:
+    """Tests for schema initialization."""
+
+    def test_init_db_records_schema_version(self, temp_db):
+        """Test init_db stamps PRAGMA user_version."""
+        from utils.database import SCHEMA_VERSION, get_connection
+
+        version = get_connection().execute('PRAGMA user_version').fetchone()[0]
+        assert version == SCHEMA_VERSION
+
+    def test_admin_user_seeded_on_demand(self, temp_db):
+        """Test init_db leaves users empty and ensure_admin_user seeds it once."""
+        from utils.database import ensure_admin_user, get_db_read
+
+        with get_db_read() as conn:
+            assert conn.execute('SELECT COUNT(*) FROM users').fetchone()[0] == 0
+
+        ensure_admin_user()
+        ensure_admin_user()
+
+        with get_db_read() as conn:
+            rows = conn.execute('SELECT role FROM users').fetchall()
+        assert [row['role'] for row in rows] == ['admin']
+
+    def test_init_db_skips_ddl_when_current(self, temp_db):
+        """Test init_db does not re-run DDL on an up-to-date database."""
+        from utils.database import get_connection, init_db
+
+        statements = []
+        get_connection().set_trace_callback(statements.append)
+        try:
+            init_db()
+        finally:
+            get_connection().set_trace_callback(None)
+
+        assert not any('CREATE' in sql for sql in statements)
+
+    def test_tscm_queries_use_indexes(self, temp_db):
+        """Test hot TSCM filters are served by an index rather than a scan."""
+        from utils.database import get_db
+
+        queries = [
+            'SELECT * FROM tscm_threats WHERE sweep_id = 1 ORDER BY detected_at DESC',
+            'SELECT severity, COUNT(*) FROM tscm_threats WHERE acknowledged = 0 GROUP BY severity',
+            'SELECT * FROM tscm_baselines WHERE is_active = 1 LIMIT 1',
+            "SELECT * FROM tscm_threats WHERE sweep_id = 1 AND severity = 'high' "
+            'ORDER BY detected_at DESC',
+            "SELECT * FROM tscm_device_timelines WHERE device_identifier = 'x' "
+            'AND timestamp > 0 ORDER BY timestamp DESC, id DESC',
+            "SELECT signal_strength FROM signal_history WHERE mode = 'wifi' "
+            "AND device_id = 'x' AND timestamp > 0 ORDER BY timestamp DESC, id DESC",
+            "SELECT * FROM tscm_known_devices WHERE identifier = 'x'",
+        ]
+        with get_db() as conn:
+            for sql in queries:
+                plan = ' '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+                assert 'USING' in plan and 'INDEX' in plan, plan
+                assert 'TEMP B-TREE' not in plan, plan
+
+    def test_migrates_text_signal_timestamps(self, temp_db):
+        """Test old TEXT signal_history timestamps are converted to epoch."""
+        from utils.database import get_db, get_signal_history, init_db
+
+        with get_db() as conn:
+            conn.execute('DROP TABLE signal_history')
+            conn.execute('''
+                CREATE TABLE signal_history (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    mode TEXT NOT NULL,
+                    device_id TEXT NOT NULL,
+                    signal_strength REAL,
+                    timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    metadata TEXT
+                )
+            ''')
+            conn.execute('''
+                INSERT INTO signal_history (mode, device_id, signal_strength, metadata)
+                VALUES ('wifi', 'AA:BB:CC:DD:EE:FF', -65, '{"ssid": "Net"}')
+            ''')
+            conn.execute('PRAGMA user_version = 0')
+
+        init_db()
+
+        with get_db() as conn:
+            row = conn.execute('SELECT typeof(timestamp) FROM signal_history').fetchone()
+        assert row[0] == 'integer'
+        history = get_signal_history('wifi', 'AA:BB:CC:DD:EE:FF')
+        assert len(history) == 1
+        assert history[0]['metadata'] == {'ssid': 'Net'}
+
+
+class TestJsonCodec:
+    """Tests for the JSON encode/decode helpers."""
+
+    def test_round_trip(self):
+        """Test values survive encode/decode."""
+        from utils.database import _dumps, _loads
+
+        value = {'a': [1, 2.5, None], 'b': {'nested': True}, 'c': 'text'}
+        assert _loads(_dumps(value)) == value
+
+    def test_falls_back_to_json_for_nan(self):
+        """Test text only the stdlib decoder accepts still decodes."""
+        import math
+        from utils.database import _loads
+
+        assert math.isnan(_loads('{"x": NaN}')['x'])
+
+    def test_without_orjson(self):
+        """Test the stdlib json path is used when orjson is missing."""
+        from utils.database import _dumps, _loads
+
+        with patch('utils.database.ORJSON_AVAILABLE', False):
+            assert _loads(_dumps({'k': [1, 2]})) == {'k': [1, 2]}
+
+
 class TestSettingsCRUD:
     """Tests for settings CRUD operations."""
 
@@ -62,6 +215,25 @@ class TestSettingsCRUD:
         assert get_setting('bool_true') is True
         assert get_setting('bool_false') is False
 
+    def test_migrates_text_bool_settings(self, temp_db):
+        """Test legacy 'true'/'false' bool settings are rewritten as '1'/'0'."""
+        import utils.database as db_module
+
+        with db_module.get_db() as conn:
+            conn.executemany(
+                "INSERT INTO settings (key, value, value_type) VALUES (?, ?, 'bool')",
+                [('on', 'True'), ('yes', 'yes'), ('off', 'false')]
+            )
+            conn.execute('PRAGMA user_version = 0')
+        db_module.close_db()
+        db_module.init_db()
+
+        with db_module.get_db_read() as conn:
+            rows = dict(conn.execute('SELECT key, value FROM settings').fetchall())
+        assert rows == {'on': '1', 'yes': '1', 'off': '0'}
+        assert db_module.get_setting('on') is True
+        assert db_module.get_setting('off') is False
+
     def test_set_and_get_dict(self, temp_db):
         """Test setting and getting dictionary values."""
         from utils.database import set_setting, get_setting
@@ -118,6 +290,17 @@ class TestSettingsCRUD:
         result = delete_setting('nonexistent_key')
         assert result is False
 
+    def test_set_setting_subclass_values(self, temp_db):
+        """Test subclasses of supported types keep their base encoding."""
+        from collections import OrderedDict
+        from utils.database import set_setting, get_setting
+
+        set_setting('ordered', OrderedDict(a=1))
+        set_setting('none_value', None)
+
+        assert get_setting('ordered') == {'a': 1}
+        assert get_setting('none_value') == 'None'
+
     def test_get_all_settings(self, temp_db):
         """Test getting all settings."""
         from utils.database import set_setting, get_all_settings
@@ -134,6 +317,55 @@ class TestSettingsCRUD:
         assert all_settings['key3'] is True
 
 
+class TestSettingsCache:
+    """Tests for the in-process settings cache."""
+
+    def test_get_setting_served_from_cache(self, temp_db):
+        """Test cached values are returned until the cache is invalidated."""
+        from utils.database import (
+            get_db, get_setting, invalidate_settings_cache, set_setting
+        )
+
+        set_setting('cached_key', 'first')
+        with get_db() as conn:
+            conn.execute("UPDATE settings SET value = 'second' WHERE key = 'cached_key'")
+
+        assert get_setting('cached_key') == 'first'
+        invalidate_settings_cache()
+        assert get_setting('cached_key') == 'second'
+
+    def test_delete_setting_updates_cache(self, temp_db):
+        """Test deleted settings fall back to the default."""
+        from utils.database import delete_setting, get_setting, set_setting
+
+        set_setting('gone', 1)
+        assert get_setting('gone') == 1
+        delete_setting('gone')
+        assert get_setting('gone', 'default') == 'default'
+
+    def test_get_all_settings_served_from_cache(self, temp_db):
+        """Test get_all_settings reflects writes without re-reading the table."""
+        from utils.database import (
+            delete_setting, get_all_settings, get_db, set_setting
+        )
+
+        set_setting('kept', 1)
+        set_setting('dropped', 2)
+        delete_setting('dropped')
+        with get_db() as conn:
+            conn.execute("UPDATE settings SET value = '3' WHERE key = 'kept'")
+
+        assert get_all_settings() == {'kept': 1}
+
+    def test_cached_json_values_are_not_shared(self, temp_db):
+        """Test callers get independent copies of JSON settings."""
+        from utils.database import get_setting, set_setting
+
+        set_setting('json_key', {'a': [1]})
+        get_setting('json_key')['a'].append(2)
+        assert get_setting('json_key') == {'a': [1]}
+
+
 class TestSignalHistory:
     """Tests for signal history operations."""
 
@@ -165,6 +397,47 @@ class TestSignalHistory:
         assert len(history) == 1
         assert history[0]['metadata'] == metadata
 
+    def test_signal_history_typed_metadata_columns(self, temp_db):
+        """Test channel/frequency are stored in their own columns."""
+        from utils.database import add_signal_reading, get_connection, get_signal_history
+
+        add_signal_reading('wifi', 'AA:BB:CC:DD:EE:FF', -65, {'channel': 11, 'frequency': 2462.0})
+        add_signal_reading('wifi', 'AA:BB:CC:DD:EE:FF', -60, {'channel': 'auto'})
+
+        rows = get_connection().execute(
+            'SELECT channel, frequency, metadata FROM signal_history ORDER BY id'
+        ).fetchall()
+        assert tuple(rows[0]) == (11, 2462.0, None)
+        assert rows[1]['channel'] is None
+
+        history = get_signal_history('wifi', 'AA:BB:CC:DD:EE:FF')
+        assert history[0]['metadata'] == {'channel': 11, 'frequency': 2462.0}
+        assert history[1]['metadata'] == {'channel': 'auto'}
+
+    def test_signal_history_metadata_round_trips_exactly(self, temp_db):
+        """Test metadata comes back with its original value types and key order."""
+        from utils.database import add_signal_reading, get_connection, get_signal_history
+
+        stored = [
+            {'frequency': 2412, 'channel': 1, 'ssid': 'x'},
+            {'ssid': 'y', 'channel': 6, 'frequency': 2437.0},
+            {'channel': 3.0, 'frequency': 2422.5},
+        ]
+        for i, metadata in enumerate(stored):
+            add_signal_reading('wifi', 'AA:BB:CC:DD:EE:FF', -60 - i, metadata)
+
+        history = get_signal_history('wifi', 'AA:BB:CC:DD:EE:FF')
+        for entry, metadata in zip(history, stored):
+            assert list(entry['metadata'].items()) == list(metadata.items())
+            assert [type(v) for v in entry['metadata'].values()] == [
+                type(v) for v in metadata.values()
+            ]
+
+        rows = get_connection().execute(
+            'SELECT channel, frequency FROM signal_history ORDER BY id'
+        ).fetchall()
+        assert [tuple(row) for row in rows] == [(1, 2412.0), (6, 2437.0), (None, 2422.5)]
+
     def test_signal_history_limit(self, temp_db):
         """Test signal history respects limit parameter."""
         from utils.database import add_signal_reading, get_signal_history
@@ -190,6 +463,50 @@ class TestSignalHistory:
         assert history_a[0]['signal'] == -65
         assert history_b[0]['signal'] == -70
 
+    def test_add_signal_readings_bulk(self, temp_db):
+        """Test bulk readings are stored with their metadata split out."""
+        from utils.database import add_signal_readings_bulk, get_signal_history
+
+        add_signal_readings_bulk([
+            ('wifi', 'AA:BB:CC:DD:EE:FF', -65, {'channel': 6, 'ssid': 'x'}),
+            ('wifi', 'AA:BB:CC:DD:EE:FF', -62, None),
+            ('bluetooth', '11:22:33:44:55:66', -80, None),
+        ])
+
+        history = get_signal_history('wifi', 'AA:BB:CC:DD:EE:FF')
+        assert len(history) == 2
+        assert {'channel': 6, 'ssid': 'x'} in [h['metadata'] for h in history]
+        assert len(get_signal_history('bluetooth', '11:22:33:44:55:66')) == 1
+
+    def test_concurrent_reading_errors_stay_with_their_caller(self, temp_db):
+        """Test a bad reading fails its own call without dropping others' readings."""
+        import threading
+        import utils.database as db_module
+
+        errors = {}
+
+        def add(name, metadata):
+            try:
+                db_module.add_signal_reading('wifi', name, -60, metadata)
+            except Exception as e:
+                errors[name] = e
+
+        # Both callers wait on the writer together, as under real contention
+        with db_module._writer_lock:
+            threads = [
+                threading.Thread(target=add, args=('BAD', {'channel': 2 ** 70})),
+                threading.Thread(target=add, args=('GOOD', None)),
+            ]
+            for thread in threads:
+                thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert set(errors) == {'BAD'}
+        assert isinstance(errors['BAD'], OverflowError)
+        assert len(db_module.get_signal_history('wifi', 'GOOD')) == 1
+        assert db_module.get_signal_history('wifi', 'BAD') == []
+
     def test_cleanup_old_signal_history(self, temp_db):
         """Test cleanup of old signal history."""
         from utils.database import add_signal_reading, cleanup_old_signal_history
@@ -202,6 +519,39 @@ class TestSignalHistory:
         assert isinstance(deleted, int)
 
 
+class TestMaintenance:
+    """Tests for periodic database maintenance."""
+
+    def test_run_maintenance_prunes_signal_history(self, temp_db):
+        """Test maintenance removes expired signal readings only."""
+        from utils.database import (
+            add_signal_reading, get_db, get_signal_history, run_maintenance
+        )
+
+        add_signal_reading('wifi', 'AA:BB:CC:DD:EE:FF', -65)
+        with get_db() as conn:
+            conn.execute('''
+                INSERT INTO signal_history (mode, device_id, signal_strength, timestamp)
+                VALUES ('wifi', 'AA:BB:CC:DD:EE:FF', -70, strftime('%s', 'now', '-2 days'))
+            ''')
+
+        assert run_maintenance() == 1
+        assert len(get_signal_history('wifi', 'AA:BB:CC:DD:EE:FF', since_minutes=10000)) == 1
+
+    def test_cleanup_signal_history_in_batches(self, temp_db):
+        """Test batched cleanup deletes every expired row."""
+        from utils.database import cleanup_old_signal_history, get_db
+
+        with get_db() as conn:
+            conn.executemany('''
+                INSERT INTO signal_history (mode, device_id, signal_strength, timestamp)
+                VALUES ('wifi', ?, -70, strftime('%s', 'now', '-2 days'))
+            ''', [(f'dev{i}',) for i in range(7)])
+
+        with patch('utils.database._CLEANUP_BATCH_SIZE', 3):
+            assert cleanup_old_signal_history(24) == 7
+
+
 class TestDeviceCorrelations:
     """Tests for device correlation operations."""
 
@@ -254,3 +604,602 @@ class TestDeviceCorrelations:
                    if c['wifi_mac'] == 'AA:AA:AA:AA:AA:AA']
         assert len(matching) == 1
         assert matching[0]['confidence'] == 0.9
+
+    def test_add_correlations_bulk(self, temp_db):
+        """Test bulk correlation upserts."""
+        from utils.database import add_correlations_bulk, get_correlations
+
+        add_correlations_bulk([
+            ('AA:AA:AA:AA:AA:AA', 'BB:BB:BB:BB:BB:BB', 0.8, {'wifi_name': 'a'}),
+            ('CC:CC:CC:CC:CC:CC', 'DD:DD:DD:DD:DD:DD', 0.9, None),
+        ])
+        add_correlations_bulk([
+            ('AA:AA:AA:AA:AA:AA', 'BB:BB:BB:BB:BB:BB', 0.95, None),
+        ])
+
+        correlations = {c['wifi_mac']: c for c in get_correlations(min_confidence=0.0)}
+        assert len(correlations) == 2
+        assert correlations['AA:AA:AA:AA:AA:AA']['confidence'] == 0.95
+        assert correlations['CC:CC:CC:CC:CC:CC']['metadata'] is None
+
+
+class TestTSCMBulkInserts:
+    """Tests for batched TSCM inserts."""
+
+    def test_add_tscm_threats_bulk(self, temp_db):
+        """Test bulk threat insert returns IDs in input order."""
+        from utils.database import (
+            add_tscm_threat, add_tscm_threats_bulk, create_tscm_sweep, get_tscm_threats
+        )
+
+        sweep_id = create_tscm_sweep('quick')
+        ids = add_tscm_threats_bulk(sweep_id, [
+            {'threat_type': 'rogue_ap', 'severity': 'high', 'source': 'wifi',
+             'identifier': 'AA:AA:AA:AA:AA:AA', 'details': {'ssid': 'x'}},
+            {'threat_type': 'tracker', 'severity': 'low', 'source': 'bluetooth',
+             'identifier': 'BB:BB:BB:BB:BB:BB'},
+        ])
+        single_id = add_tscm_threat(sweep_id, 'bug', 'critical', 'rf', '433.920')
+
+        assert len(ids) == 2 and ids[0] < ids[1] < single_id
+        threats = {t['id']: t for t in get_tscm_threats(sweep_id=sweep_id)}
+        assert threats[ids[0]]['details'] == {'ssid': 'x'}
+        assert threats[ids[1]]['identifier'] == 'BB:BB:BB:BB:BB:BB'
+
+    def test_get_tscm_threats_field_types(self, temp_db):
+        """Test threat rows keep their decoded field types."""
+        from utils.database import (
+            acknowledge_tscm_threat, add_tscm_threat, create_tscm_sweep, get_db, get_tscm_threats
+        )
+
+        sweep_id = create_tscm_sweep('quick')
+        first = add_tscm_threat(sweep_id, 'bug', 'high', 'rf', '433.920',
+                                frequency=433.92, details={'band': [1, 2]},
+                                gps_coords={'lat': 51.5, 'lon': -0.1})
+        second = add_tscm_threat(sweep_id, 'tracker', 'low', 'bluetooth', 'CC:CC')
+        acknowledge_tscm_threat(second)
+        with get_db() as conn:
+            # Text the stdlib encoder writes but SQLite's json() rejects
+            conn.execute('UPDATE tscm_threats SET details = ? WHERE id = ?',
+                         ('{"level": NaN}', second))
+
+        threats = {t['id']: t for t in get_tscm_threats(sweep_id=sweep_id)}
+        assert threats[first]['details'] == {'band': [1, 2]}
+        assert threats[first]['gps_coords'] == {'lat': 51.5, 'lon': -0.1}
+        assert threats[first]['frequency'] == 433.92
+        assert threats[first]['acknowledged'] is False
+        assert threats[second]['acknowledged'] is True
+        assert threats[second]['gps_coords'] is None
+        assert 'level' in threats[second]['details']
+        assert [t['id'] for t in get_tscm_threats(acknowledged=False)] == [first]
+        assert get_tscm_threats(sweep_id=9999) == []
+
+    def test_json_string_scalars_round_trip(self, temp_db):
+        """Test JSON columns holding a plain string decode to that string."""
+        from utils.database import (
+            add_device_timeline_entry, add_tscm_threat, create_tscm_sweep,
+            get_device_timeline, get_tscm_threats
+        )
+
+        sweep_id = create_tscm_sweep('quick')
+        add_tscm_threat(sweep_id, 'bug', 'high', 'rf', '433.920', details='plain string')
+        add_device_timeline_entry('AA:AA', 'wifi', attributes='seen once')
+
+        threat = get_tscm_threats(sweep_id=sweep_id)[0]
+        assert threat['details'] == 'plain string'
+        assert get_device_timeline('AA:AA')[0]['attributes'] == 'seen once'
+
+    def test_real_columns_keep_full_precision(self, temp_db):
+        """Test REAL columns come back exactly as stored."""
+        from utils.database import (
+            add_device_timeline_entry, add_tscm_threat, create_tscm_sweep,
+            get_device_timeline, get_tscm_threats
+        )
+
+        frequency = 433.9212345678901
+        sweep_id = create_tscm_sweep('quick')
+        add_tscm_threat(sweep_id, 'bug', 'high', 'rf', '433.921', frequency=frequency)
+        add_device_timeline_entry('AA:AA', 'rf', frequency=frequency)
+
+        assert get_tscm_threats(sweep_id=sweep_id)[0]['frequency'] == frequency
+        assert get_device_timeline('AA:AA')[0]['frequency'] == frequency
+
+    def test_threat_summary(self, temp_db):
+        """Test the unacknowledged threat summary counts."""
+        from utils.database import (
+            acknowledge_tscm_threat, add_tscm_threats_bulk, create_tscm_sweep,
+            get_tscm_threat_summary
+        )
+
+        empty = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'total': 0}
+        assert get_tscm_threat_summary() == empty
+
+        sweep_id = create_tscm_sweep('quick')
+        ids = add_tscm_threats_bulk(sweep_id, [
+            {'threat_type': 't', 'severity': sev, 'source': 'wifi', 'identifier': str(i)}
+            for i, sev in enumerate(['high', 'high', 'low', 'critical'])
+        ])
+        acknowledge_tscm_threat(ids[3])
+
+        assert get_tscm_threat_summary() == {
+            'critical': 0, 'high': 2, 'medium': 0, 'low': 1, 'total': 3
+        }
+
+    def test_add_device_timeline_entries_bulk(self, temp_db):
+        """Test bulk timeline insert."""
+        from utils.database import add_device_timeline_entries_bulk, get_device_timeline
+
+        add_device_timeline_entries_bulk([
+            {'device_identifier': 'AA:AA:AA:AA:AA:AA', 'protocol': 'wifi', 'rssi': -50,
+             'attributes': {'ssid': 'x'}},
+            {'device_identifier': 'AA:AA:AA:AA:AA:AA', 'protocol': 'wifi', 'rssi': -55},
+        ])
+
+        timeline = get_device_timeline('AA:AA:AA:AA:AA:AA')
+        assert len(timeline) == 2
+
+    def test_timeline_returns_newest_oldest_first(self, temp_db):
+        """Test the timeline keeps the newest entries in chronological order."""
+        from utils.database import add_device_timeline_entries_bulk, get_db, get_device_timeline
+
+        add_device_timeline_entries_bulk([
+            {'device_identifier': 'AA:AA', 'protocol': 'wifi', 'rssi': rssi}
+            for rssi in (-10, -20, -30, -40)
+        ])
+        with get_db() as conn:
+            conn.execute(
+                "UPDATE tscm_device_timelines SET timestamp = datetime('now', '-1 hours') "
+                "WHERE rssi = -10"
+            )
+
+        assert [e['rssi'] for e in get_device_timeline('AA:AA', limit=2)] == [-30, -40]
+        assert [e['rssi'] for e in get_device_timeline('AA:AA')] == [-10, -20, -30, -40]
+
+    def test_timeline_age_cutoffs(self, temp_db):
+        """Test timeline reads and cleanup honour their age cutoffs."""
+        from utils.database import (
+            add_device_timeline_entries_bulk, cleanup_old_timeline_entries,
+            get_db, get_device_timeline
+        )
+
+        add_device_timeline_entries_bulk([
+            {'device_identifier': 'AA:AA', 'protocol': 'wifi', 'rssi': -50},
+            {'device_identifier': 'AA:AA', 'protocol': 'wifi', 'rssi': -60},
+        ])
+        with get_db() as conn:
+            conn.execute(
+                "UPDATE tscm_device_timelines SET timestamp = datetime('now', '-100 hours') "
+                "WHERE rssi = -60"
+            )
+
+        assert [e['rssi'] for e in get_device_timeline('AA:AA')] == [-50]
+        assert len(get_device_timeline('AA:AA', since_hours=200)) == 2
+
+        assert cleanup_old_timeline_entries(max_age_hours=72) == 1
+        assert [e['rssi'] for e in get_device_timeline('AA:AA', since_hours=200)] == [-50]
+
+
+class TestKnownDeviceRegistry:
+    """Tests for known-good registry lookups."""
+
+    def test_migration_upper_cases_legacy_identifiers(self, temp_db):
+        """Test rebuilding for the CHECK normalises lower-case identifiers."""
+        import utils.database as db_module
+
+        with db_module.get_db() as conn:
+            conn.execute('DROP TABLE tscm_known_devices')
+            conn.execute('''
+                CREATE TABLE tscm_known_devices (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    identifier TEXT NOT NULL UNIQUE,
+                    protocol TEXT NOT NULL,
+                    name TEXT,
+                    description TEXT,
+                    location TEXT,
+                    scope TEXT DEFAULT 'global',
+                    added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    added_by TEXT,
+                    last_verified TIMESTAMP,
+                    score_modifier INTEGER DEFAULT -2,
+                    metadata TEXT
+                )
+            ''')
+            conn.execute(
+                "INSERT INTO tscm_known_devices (identifier, protocol, name) "
+                "VALUES ('aa:bb:cc:dd:ee:ff', 'wifi', 'Office AP')"
+            )
+            conn.execute('PRAGMA user_version = 0')
+
+        db_module.init_db()
+
+        with db_module.get_db_read() as conn:
+            rows = conn.execute('SELECT identifier, name FROM tscm_known_devices').fetchall()
+        assert [tuple(row) for row in rows] == [('AA:BB:CC:DD:EE:FF', 'Office AP')]
+        assert db_module.is_known_good_device('aa:bb:cc:dd:ee:ff')['name'] == 'Office AP'
+
+    def test_lookup_reflects_registry_changes(self, temp_db):
+        """Test cached lookups are invalidated by add/delete."""
+        from utils.database import (
+            add_known_device, delete_known_device, get_known_device, is_known_good_device
+        )
+
+        assert is_known_good_device('aa:bb:cc:dd:ee:ff') is None
+
+        add_known_device('aa:bb:cc:dd:ee:ff', 'wifi', name='Office AP', location='HQ',
+                         scope='location', metadata={'floor': 2})
+        assert is_known_good_device('AA:BB:CC:DD:EE:FF')['name'] == 'Office AP'
+        assert is_known_good_device('AA:BB:CC:DD:EE:FF', location='HQ') is not None
+        assert is_known_good_device('AA:BB:CC:DD:EE:FF', location='Branch') is None
+
+        device = get_known_device('aa:bb:cc:dd:ee:ff')
+        assert device['metadata'] == {'floor': 2}
+        device['metadata']['floor'] = 3
+        assert get_known_device('aa:bb:cc:dd:ee:ff')['metadata'] == {'floor': 2}
+
+        delete_known_device('aa:bb:cc:dd:ee:ff')
+        assert is_known_good_device('AA:BB:CC:DD:EE:FF') is None
+        assert get_known_device('aa:bb:cc:dd:ee:ff') is None
+
+    def test_lookups_served_from_memory(self, temp_db):
+        """Test the registry is loaded once and misses do not query."""
+        from utils.database import add_known_device, get_read_connection, is_known_good_device
+
+        add_known_device('AA:AA', 'wifi', name='Global')
+        statements = []
+        get_read_connection().set_trace_callback(statements.append)
+        try:
+            assert is_known_good_device('aa:aa', location='Branch')['name'] == 'Global'
+            for i in range(20):
+                assert is_known_good_device(f'FF:{i:02d}') is None
+        finally:
+            get_read_connection().set_trace_callback(None)
+
+        assert len(statements) == 1
+
+    def test_iter_known_devices_filters_by_location(self, temp_db):
+        """Test the generator yields location and global devices lazily."""
+        from utils.database import add_known_device, get_all_known_devices, iter_known_devices
+
+        add_known_device('AA:AA', 'wifi', scope='global')
+        add_known_device('BB:BB', 'wifi', location='HQ', scope='location')
+        add_known_device('CC:CC', 'wifi', location='Branch', scope='location')
+
+        devices = iter_known_devices(location='HQ')
+        assert not isinstance(devices, list)
+        assert {d['identifier'] for d in devices} == {'AA:AA', 'BB:BB'}
+        assert len(get_all_known_devices()) == 3
+
+    def test_identifiers_stored_upper_case(self, temp_db):
+        """Test the registry rejects identifiers that are not upper-cased."""
+        import sqlite3
+        from utils.database import get_db, get_db_read, init_db
+
+        with get_db() as conn:
+            conn.execute('DROP TABLE tscm_known_devices')
+            conn.execute('''
+                CREATE TABLE tscm_known_devices (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    identifier TEXT NOT NULL UNIQUE,
+                    protocol TEXT NOT NULL,
+                    name TEXT
+                )
+            ''')
+            conn.execute("INSERT INTO tscm_known_devices (identifier, protocol, name) "
+                         "VALUES ('AA:BB', 'wifi', 'Kept')")
+            conn.execute('PRAGMA user_version = 0')
+
+        init_db()
+
+        with get_db_read() as conn:
+            row = conn.execute('SELECT identifier, name, scope FROM tscm_known_devices').fetchone()
+        assert tuple(row) == ('AA:BB', 'Kept', 'global')
+        with pytest.raises(sqlite3.IntegrityError):
+            with get_db() as conn:
+                conn.execute("INSERT INTO tscm_known_devices (identifier, protocol) "
+                             "VALUES ('cc:dd', 'wifi')")
+
+    def test_upsert_returns_existing_id(self, temp_db):
+        """Test re-adding a known device returns the id of the updated row."""
+        from utils.database import add_known_device, get_known_device
+
+        first = add_known_device('11:11', 'wifi', name='One')
+        add_known_device('22:22', 'wifi', name='Two')
+        assert add_known_device('11:11', 'wifi', name='Renamed') == first
+        assert get_known_device('11:11')['id'] == first
+
+    def test_insert_ids_without_returning(self, temp_db):
+        """Test the lastrowid fallback for SQLite older than 3.35."""
+        import utils.database as db_module
+
+        with patch.object(db_module, '_HAS_RETURNING', False):
+            sweep_id = db_module.create_tscm_sweep('quick')
+            case_id = db_module.create_tscm_case('Case')
+        assert db_module.get_tscm_sweep(sweep_id)['sweep_type'] == 'quick'
+        assert db_module.get_tscm_case(case_id)['name'] == 'Case'
+
+
+class TestTSCMBaselines:
+    """Tests for TSCM baseline activation."""
+
+    def test_set_active_baseline(self, temp_db):
+        """Test exactly one baseline is active after switching."""
+        from utils.database import (
+            create_tscm_baseline, get_active_tscm_baseline, set_active_tscm_baseline
+        )
+
+        first = create_tscm_baseline('First', wifi_networks=[{'bssid': 'AA'}])
+        second = create_tscm_baseline('Second')
+
+        assert set_active_tscm_baseline(first) is True
+        active = get_active_tscm_baseline()
+        assert active['id'] == first
+        assert active['wifi_networks'] == [{'bssid': 'AA'}]
+
+        assert set_active_tscm_baseline(second) is True
+        assert get_active_tscm_baseline()['id'] == second
+
+    def test_set_active_baseline_touches_only_switched_rows(self, temp_db):
+        """Test switching rewrites the old and new active rows only."""
+        from utils.database import create_tscm_baseline, get_connection, set_active_tscm_baseline
+
+        ids = [create_tscm_baseline(f'Baseline {i}') for i in range(5)]
+        set_active_tscm_baseline(ids[0])
+
+        before = get_connection().total_changes
+        set_active_tscm_baseline(ids[1])
+        assert get_connection().total_changes - before == 2
+
+    def test_set_active_missing_baseline_keeps_current(self, temp_db):
+        """Test an unknown ID leaves the active baseline untouched."""
+        from utils.database import (
+            create_tscm_baseline, get_active_tscm_baseline, set_active_tscm_baseline
+        )
+
+        baseline_id = create_tscm_baseline('Only')
+        set_active_tscm_baseline(baseline_id)
+
+        assert set_active_tscm_baseline(9999) is False
+        assert get_active_tscm_baseline()['id'] == baseline_id
+
+    def test_list_baselines(self, temp_db):
+        """Test the baseline listing returns its scalar columns by name."""
+        from utils.database import create_tscm_baseline, get_all_tscm_baselines
+
+        baseline_id = create_tscm_baseline('Office', location='HQ', bt_devices=[{'mac': 'AA'}])
+        baselines = get_all_tscm_baselines()
+        assert baselines == [{
+            'id': baseline_id, 'name': 'Office', 'location': 'HQ', 'description': None,
+            'created_at': baselines[0]['created_at'], 'is_active': 0,
+        }]
+
+
+class TestTSCMCases:
+    """Tests for TSCM case linking."""
+
+    def test_linking_touches_case_updated_at(self, temp_db):
+        """Test links and notes bump the case's updated_at."""
+        from utils.database import (
+            add_case_note, add_sweep_to_case, create_tscm_case, create_tscm_sweep, get_db
+        )
+
+        case_id = create_tscm_case('Case')
+        sweep_id = create_tscm_sweep('quick')
+
+        def reset_and_read(action):
+            with get_db() as conn:
+                conn.execute("UPDATE tscm_cases SET updated_at = '2000-01-01 00:00:00'")
+            action()
+            with get_db() as conn:
+                return conn.execute(
+                    'SELECT updated_at FROM tscm_cases WHERE id = ?', (case_id,)
+                ).fetchone()[0]
+
+        assert reset_and_read(lambda: add_sweep_to_case(case_id, sweep_id)) != '2000-01-01 00:00:00'
+        assert reset_and_read(lambda: add_case_note(case_id, 'note')) != '2000-01-01 00:00:00'
+        # Duplicate link is rejected and does not touch the case
+        assert reset_and_read(lambda: add_sweep_to_case(case_id, sweep_id)) == '2000-01-01 00:00:00'
+
+    def test_link_results(self, temp_db):
+        """Test link functions report new, duplicate and dangling links."""
+        from utils.database import (
+            add_sweep_to_case, add_threat_to_case, add_tscm_threat, create_tscm_case,
+            create_tscm_sweep
+        )
+
+        case_id = create_tscm_case('Case')
+        sweep_id = create_tscm_sweep('quick')
+        threat_id = add_tscm_threat(sweep_id, 'bug', 'high', 'rf', '433.920')
+
+        assert add_sweep_to_case(case_id, sweep_id) is True
+        assert add_sweep_to_case(case_id, sweep_id) is False
+        assert add_sweep_to_case(case_id, 9999) is False
+        assert add_threat_to_case(case_id, threat_id) is True
+        assert add_threat_to_case(case_id, threat_id) is False
+        assert add_threat_to_case(9999, threat_id) is False
+
+    def test_get_cases_with_children(self, temp_db):
+        """Test several cases are fetched with their children in one call."""
+        from utils.database import (
+            add_case_note, add_sweep_to_case, create_tscm_case, create_tscm_sweep,
+            get_tscm_case, get_tscm_cases_with_children
+        )
+
+        first = create_tscm_case('First')
+        second = create_tscm_case('Second')
+        add_sweep_to_case(first, create_tscm_sweep('quick'))
+        add_case_note(second, 'note')
+
+        cases = get_tscm_cases_with_children([first, second, 9999])
+        assert set(cases) == {first, second}
+        assert cases[first] == get_tscm_case(first)
+        assert [n['content'] for n in cases[second]['case_notes']] == ['note']
+        assert get_tscm_cases_with_children([]) == {}
+
+    def test_case_routes_keep_payload_fields(self, temp_db):
+        """Test the case endpoints still return metadata and child JSON columns."""
+        from flask import Flask
+        from routes.tscm import tscm_bp
+        from utils.database import (
+            add_sweep_to_case, add_threat_to_case, add_tscm_threat, create_tscm_case,
+            create_tscm_sweep, update_tscm_sweep
+        )
+
+        case_id = create_tscm_case('Case', metadata={'floor': 3})
+        sweep_id = create_tscm_sweep('quick')
+        update_tscm_sweep(sweep_id, results={'wifi_devices': [1]})
+        threat_id = add_tscm_threat(sweep_id, 'bug', 'high', 'rf', '433.920',
+                                    details={'band': 1}, gps_coords={'lat': 1.0})
+        add_sweep_to_case(case_id, sweep_id)
+        add_threat_to_case(case_id, threat_id)
+
+        app = Flask(__name__)
+        app.register_blueprint(tscm_bp)
+        client = app.test_client()
+
+        listed = client.get('/tscm/cases').get_json()['cases'][0]
+        assert 'metadata' in listed
+        slim = client.get('/tscm/cases?include_payload=false').get_json()['cases'][0]
+        assert 'metadata' not in slim and slim['name'] == 'Case'
+        case = client.get(f'/tscm/cases/{case_id}').get_json()['case']
+        assert case['metadata'] == {'floor': 3}
+        assert 'results' in case['sweeps'][0] and 'anomalies' in case['sweeps'][0]
+        assert 'details' in case['threats'][0] and 'gps_coords' in case['threats'][0]
+
+    def test_children_come_back_newest_first(self, temp_db):
+        """Test case children and threats come back in their documented order."""
+        from utils.database import (
+            add_sweep_to_case, add_threat_to_case, add_tscm_threat, create_tscm_case,
+            create_tscm_sweep, get_db, get_tscm_case, get_tscm_threats
+        )
+
+        case_id = create_tscm_case('Case')
+        sweep_ids = [create_tscm_sweep('quick') for _ in range(3)]
+        threat_ids = [add_tscm_threat(sweep_ids[0], 'bug', 'high', 'rf', str(i)) for i in range(3)]
+        # Newest first is the reverse of neither insertion nor id order
+        times = ['2024-01-02 00:00:00', '2024-01-03 00:00:00', '2024-01-01 00:00:00']
+        with get_db() as conn:
+            for sweep_id, threat_id, ts in zip(sweep_ids, threat_ids, times):
+                conn.execute('UPDATE tscm_sweeps SET started_at = ? WHERE id = ?', (ts, sweep_id))
+                conn.execute('UPDATE tscm_threats SET detected_at = ? WHERE id = ?', (ts, threat_id))
+        for sweep_id, threat_id in zip(sweep_ids, threat_ids):
+            add_sweep_to_case(case_id, sweep_id)
+            add_threat_to_case(case_id, threat_id)
+
+        newest_first = [1, 0, 2]
+        case = get_tscm_case(case_id)
+        assert [s['id'] for s in case['sweeps']] == [sweep_ids[i] for i in newest_first]
+        assert [t['id'] for t in case['threats']] == [threat_ids[i] for i in newest_first]
+        assert [t['id'] for t in get_tscm_threats()] == [threat_ids[i] for i in newest_first]
+
+    def test_case_children_keep_full_precision(self, temp_db):
+        """Test REAL columns of linked threats come back exactly as stored."""
+        from utils.database import (
+            add_threat_to_case, add_tscm_threat, create_tscm_case, create_tscm_sweep,
+            get_tscm_case, get_tscm_cases_with_children
+        )
+
+        frequency = 433.9212345678901
+        case_id = create_tscm_case('Case')
+        sweep_id = create_tscm_sweep('quick')
+        add_threat_to_case(case_id, add_tscm_threat(
+            sweep_id, 'bug', 'high', 'rf', '433.921', frequency=frequency
+        ))
+
+        assert get_tscm_case(case_id)['threats'][0]['frequency'] == frequency
+        cases = get_tscm_cases_with_children([case_id], include_payload=False)
+        assert cases[case_id]['threats'][0]['frequency'] == frequency
+
+    def test_bulk_links_and_notes(self, temp_db):
+        """Test bulk linking skips duplicates and unknown ids without aborting."""
+        from utils.database import (
+            add_case_notes, add_sweeps_to_case, add_threats_to_case, add_tscm_threat,
+            create_tscm_case, create_tscm_sweep, get_tscm_case
+        )
+
+        case_id = create_tscm_case('Case')
+        sweep_ids = [create_tscm_sweep('quick') for _ in range(3)]
+        threat_id = add_tscm_threat(sweep_ids[0], 'bug', 'high', 'rf', '433.920')
+
+        assert add_sweeps_to_case(case_id, sweep_ids[:2]) == 2
+        assert add_sweeps_to_case(case_id, [sweep_ids[1], 9999, sweep_ids[2]]) == 1
+        assert add_threats_to_case(case_id, [threat_id, threat_id]) == 1
+        assert add_threats_to_case(9999, [threat_id]) == 0
+        add_case_notes(case_id, [('first', 'general', None), ('second', 'finding', 'alice')])
+
+        case = get_tscm_case(case_id)
+        assert sorted(s['id'] for s in case['sweeps']) == sweep_ids
+        assert [t['id'] for t in case['threats']] == [threat_id]
+        assert {n['content'] for n in case['case_notes']} == {'first', 'second'}
+
+    def test_sweep_payload_on_request(self, temp_db):
+        """Test sweep and case listings skip JSON payloads unless asked."""
+        import json
+        from utils.database import (
+            create_tscm_case, create_tscm_sweep, get_all_tscm_cases, get_tscm_sweep,
+            update_tscm_sweep
+        )
+
+        sweep_id = create_tscm_sweep('quick')
+        update_tscm_sweep(sweep_id, results={'wifi_devices': [1]}, anomalies=['a'])
+
+        sweep = get_tscm_sweep(sweep_id, include_payload=False)
+        assert sweep['sweep_type'] == 'quick' and sweep['wifi_enabled'] is True
+        assert 'results' not in sweep and 'anomalies' not in sweep
+        full = get_tscm_sweep(sweep_id)
+        assert full['results'] == {'wifi_devices': [1]}
+        assert full['anomalies'] == ['a']
+
+        create_tscm_case('Case', metadata={'k': 1})
+        assert 'metadata' not in get_all_tscm_cases(include_payload=False)[0]
+        assert json.loads(get_all_tscm_cases()[0]['metadata']) == {'k': 1}
+
+    def test_update_case_fields(self, temp_db):
+        """Test partial case updates touch only the given fields."""
+        from utils.database import create_tscm_case, get_tscm_case, update_tscm_case
+
+        case_id = create_tscm_case('Case', priority='high')
+        assert update_tscm_case(case_id, assigned_to='alice')
+        case = get_tscm_case(case_id)
+        assert case['assigned_to'] == 'alice' and case['priority'] == 'high'
+        assert case['closed_at'] is None
+
+        assert update_tscm_case(case_id, status='closed')
+        case = get_tscm_case(case_id)
+        assert case['status'] == 'closed' and case['closed_at'] is not None
+        assert not update_tscm_case(9999, notes='missing')
+
+    def test_get_case_embeds_children(self, temp_db):
+        """Test get_tscm_case returns linked sweeps, threats and notes."""
+        from utils.database import (
+            add_case_note, add_sweep_to_case, add_threat_to_case, add_tscm_threat,
+            create_tscm_case, create_tscm_sweep, get_tscm_case
+        )
+
+        case_id = create_tscm_case('Case', metadata={'floor': 3})
+        sweep_id = create_tscm_sweep('quick')
+        threat_id = add_tscm_threat(
+            sweep_id, 'unknown_device', 'high', 'wifi', 'AA:BB',
+            signal_strength=-40, frequency=2437.5
+        )
+        add_sweep_to_case(case_id, sweep_id)
+        add_threat_to_case(case_id, threat_id)
+        add_case_note(case_id, 'first')
+        add_case_note(case_id, 'second')
+
+        case = get_tscm_case(case_id)
+        assert case['metadata'] == {'floor': 3}
+        assert [s['id'] for s in case['sweeps']] == [sweep_id]
+        assert case['sweeps'][0]['sweep_type'] == 'quick'
+        threat = case['threats'][0]
+        assert threat['id'] == threat_id
+        assert threat['signal_strength'] == -40
+        assert threat['frequency'] == 2437.5
+        assert {n['content'] for n in case['case_notes']} == {'first', 'second'}
+
+        assert 'details' in threat and 'results' in case['sweeps'][0]
+        slim = get_tscm_case(case_id, include_payload=False)
+        assert 'details' not in slim['threats'][0] and 'results' not in slim['sweeps'][0]
+
+        empty = get_tscm_case(create_tscm_case('Empty'))
+        assert empty['sweeps'] == [] and empty['threats'] == [] and empty['case_notes'] == []
+        assert get_tscm_case(9999) is None
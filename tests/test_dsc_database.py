@@ -127,6 +127,59 @@ class TestDSCAlertsCRUD:
         assert len(unacked) == 1
         assert len(acked) == 2
 
+    def test_get_unacknowledged_distress_alerts(self, temp_db):
+        """Test the open DISTRESS/URGENCY filter only returns matching alerts."""
+        from utils.database import (
+            store_dsc_alert,
+            get_dsc_alerts,
+            acknowledge_dsc_alert
+        )
+
+        open_id = store_dsc_alert('232123456', '100', 'DISTRESS')
+        acknowledge_dsc_alert(store_dsc_alert('366000001', '100', 'DISTRESS'))
+        store_dsc_alert('351234567', '120', 'URGENCY')
+        store_dsc_alert('257000001', '116', 'ROUTINE')
+
+        distress = get_dsc_alerts(category='DISTRESS', acknowledged=False)
+        urgency = get_dsc_alerts(category='URGENCY', acknowledged=False)
+        routine = get_dsc_alerts(category='ROUTINE', acknowledged=False)
+
+        assert [a['id'] for a in distress] == [open_id]
+        assert len(urgency) == 1
+        assert len(routine) == 1
+
+    def test_alert_queries_use_ordered_indexes(self, temp_db):
+        """Test filtered alert listings and cleanup avoid scans and sorts."""
+        from utils.database import get_db
+
+        queries = [
+            "SELECT * FROM dsc_alerts WHERE category = 'DISTRESS' AND acknowledged = 0 "
+            "ORDER BY received_at DESC, id DESC",
+            "SELECT * FROM dsc_alerts WHERE source_mmsi = '1' ORDER BY received_at DESC, id DESC",
+            "SELECT * FROM dsc_alerts WHERE acknowledged = 1 AND received_at < '2024-01-01'",
+        ]
+        with get_db() as conn:
+            for sql in queries:
+                plan = ' '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+                assert plan.startswith('SEARCH'), plan
+                assert 'TEMP B-TREE' not in plan, plan
+
+    def test_unacknowledged_summaries_use_partial_indexes(self, temp_db):
+        """Test the alert and threat summaries read only their partial indexes."""
+        from utils.database import get_db
+
+        queries = {
+            'idx_dsc_alerts_unack':
+                "SELECT SUM(UPPER(category) = 'DISTRESS') FROM dsc_alerts WHERE acknowledged = 0",
+            'idx_tscm_threats_unack':
+                'SELECT severity, COUNT(*) FROM tscm_threats WHERE acknowledged = 0',
+        }
+        with get_db() as conn:
+            for index, sql in queries.items():
+                plan = ' '.join(row[3] for row in conn.execute(f'EXPLAIN QUERY PLAN {sql}'))
+                assert f'COVERING INDEX {index}' in plan, plan
+                assert 'TEMP B-TREE' not in plan, plan
+
     def test_get_dsc_alerts_by_mmsi(self, temp_db):
         """Test filtering alerts by source MMSI."""
         from utils.database import store_dsc_alert, get_dsc_alerts
@@ -162,6 +215,46 @@ class TestDSCAlertsCRUD:
         page2_ids = {a['id'] for a in page2}
         assert page1_ids.isdisjoint(page2_ids)
 
+    def test_get_dsc_alerts_keyset_pagination(self, temp_db):
+        """Test paging with a (received_at, id) cursor."""
+        from utils.database import store_dsc_alert, get_dsc_alerts
+
+        # Same-second inserts share received_at, so id breaks the ties
+        ids = [store_dsc_alert(f'23212345{i}', '100', 'DISTRESS') for i in range(7)]
+
+        pages = []
+        cursor = {}
+        while True:
+            page = get_dsc_alerts(limit=3, **cursor)
+            if not page:
+                break
+            pages.append([a['id'] for a in page])
+            cursor = {'before_received_at': page[-1]['received_at'], 'before_id': page[-1]['id']}
+
+        assert pages == [ids[6:3:-1], ids[3:0:-1], ids[0:1]]
+
+    def test_get_dsc_alerts_columnar(self, temp_db):
+        """Test the columnar fetch matches the per-row records."""
+        from utils.database import (
+            store_dsc_alert,
+            get_dsc_alerts,
+            get_dsc_alerts_columnar,
+            acknowledge_dsc_alert
+        )
+
+        assert get_dsc_alerts_columnar()['id'] == []
+
+        store_dsc_alert('232123456', '100', 'DISTRESS')
+        acknowledge_dsc_alert(store_dsc_alert('366000001', '120', 'URGENCY'))
+
+        columns = get_dsc_alerts_columnar()
+        rows = get_dsc_alerts()
+
+        assert list(columns) == list(rows[0])
+        for name, values in columns.items():
+            assert values == [row[name] for row in rows]
+        assert columns['acknowledged'] == [True, False]
+
     def test_get_dsc_alerts_order(self, temp_db):
         """Test alerts are returned in reverse chronological order."""
         from utils.database import store_dsc_alert, get_dsc_alerts
@@ -250,6 +343,52 @@ class TestDSCAlertsCRUD:
         assert summary['safety'] == 1
         assert summary['total'] == 4
 
+    def test_get_dsc_alert_summary_total_matches_buckets(self, temp_db):
+        """Test total only counts the categories the summary reports."""
+        from utils.database import store_dsc_alert, get_dsc_alert_summary
+
+        store_dsc_alert('232123456', '100', 'DISTRESS')
+        store_dsc_alert('232123457', '100', 'distress')
+        store_dsc_alert('366000001', '102', 'ALL_SHIPS')
+
+        summary = get_dsc_alert_summary()
+
+        assert summary['distress'] == 2
+        assert summary['total'] == 2
+
+    def test_get_dsc_alert_summary_invalidated_on_write(self, temp_db):
+        """Test cached summary reflects alert writes within its TTL."""
+        from utils.database import (
+            store_dsc_alert,
+            get_dsc_alert_summary,
+            acknowledge_dsc_alert
+        )
+
+        assert get_dsc_alert_summary()['total'] == 0
+
+        alert_id = store_dsc_alert('232123456', '100', 'DISTRESS')
+        assert get_dsc_alert_summary()['distress'] == 1
+
+        acknowledge_dsc_alert(alert_id)
+        assert get_dsc_alert_summary()['distress'] == 0
+
+    def test_get_dsc_alert_summary_not_cached_across_write(self, temp_db, monkeypatch):
+        """Test a summary read before a concurrent write is not cached."""
+        import utils.database as db_module
+
+        query = db_module._query_dsc_alert_summary
+
+        def racing_query():
+            summary = query()
+            # A write that commits while the summary query is in flight
+            monkeypatch.setattr(db_module, '_query_dsc_alert_summary', query)
+            db_module.store_dsc_alert('232123456', '100', 'DISTRESS')
+            return summary
+
+        monkeypatch.setattr(db_module, '_query_dsc_alert_summary', racing_query)
+        assert db_module.get_dsc_alert_summary()['distress'] == 0
+        assert db_module.get_dsc_alert_summary()['distress'] == 1
+
     def test_get_dsc_alert_summary_empty(self, temp_db):
         """Test alert summary with no alerts."""
         from utils.database import get_dsc_alert_summary
@@ -420,3 +559,34 @@ class TestDSCDatabaseIntegration:
         # Verify each has correct nature
         natures = {a['nature_of_distress'] for a in alerts}
         assert natures == {'FIRE', 'FLOODING', 'COLLISION'}
+
+    def test_reads_not_blocked_by_open_write(self, temp_db):
+        """Test alert reads proceed while another thread holds a write transaction."""
+        import threading
+        from utils.database import get_db, get_dsc_alerts, store_dsc_alert
+
+        store_dsc_alert(source_mmsi='232123456', format_code='100', category='DISTRESS')
+
+        result = {}
+        writer_open = threading.Event()
+        reader_done = threading.Event()
+
+        def writer():
+            with get_db() as conn:
+                conn.execute(
+                    "INSERT INTO dsc_alerts (source_mmsi, format_code, category) "
+                    "VALUES ('999', '100', 'ROUTINE')"
+                )
+                writer_open.set()
+                reader_done.wait(timeout=5)
+
+        thread = threading.Thread(target=writer)
+        thread.start()
+        writer_open.wait(timeout=5)
+        result['alerts'] = get_dsc_alerts()
+        reader_done.set()
+        thread.join()
+
+        # The uncommitted insert is not visible to the reader
+        assert [a['source_mmsi'] for a in result['alerts']] == ['232123456']
+        assert len(get_dsc_alerts()) == 2
@@ -57,6 +57,27 @@ class TestToolCheck:
         """Test that nonexistent tools return False."""
         assert check_tool('nonexistent_tool_xyz_12345') is False
 
+    def test_check_all_dependencies_probes_each_tool_once(self):
+        """Test shared tools and SoapySDRUtil are probed once per check."""
+        from collections import Counter
+        from unittest.mock import patch
+        from utils import dependencies
+
+        probes = Counter()
+
+        def fake_check_tool(name):
+            probes[name] += 1
+            return name == 'rtl_fm'
+
+        with patch.object(dependencies, 'check_tool', side_effect=fake_check_tool), \
+                patch.object(dependencies, '_get_soapy_factories', return_value={'hackrf'}) as soapy:
+            results = dependencies.check_all_dependencies()
+
+        assert probes['rtl_fm'] == 1
+        assert max(probes.values()) == 1
+        assert soapy.call_count == 1
+        assert results['pager']['tools']['rtl_fm']['installed'] is True
+
 
 class TestOuiLookup:
     """Tests for OUI manufacturer lookup."""
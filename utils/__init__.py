@@ -40,4 +40,4 @@ from .validation import (
     sanitize_device_name,
 )
 from .sse import sse_stream, format_sse, clear_queue
-from .cleanup import DataStore, CleanupManager, cleanup_manager, cleanup_dict
+from .cleanup import DataStore, CleanupManager, PeriodicTask, cleanup_manager, cleanup_dict
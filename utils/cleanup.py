@@ -5,7 +5,7 @@ from __future__ import annotations
 import logging
 import threading
 import time
-from typing import Any
+from typing import Any, Callable
 
 logger = logging.getLogger('intercept.cleanup')
 
@@ -141,6 +141,32 @@ class DataStore:
         return len(expired)
 
 
+class PeriodicTask:
+    """Cleanup callable run by the cleanup manager at most once per interval."""
+
+    def __init__(self, func: Callable[[], int | None], interval: float, name: str = 'task'):
+        """
+        Initialize periodic task.
+
+        Args:
+            func: Callable returning the number of entries it removed
+            interval: Minimum seconds between runs (first run after one interval)
+            name: Name for logging purposes
+        """
+        self.func = func
+        self.interval = interval
+        self.name = name
+        self._last_run = time.monotonic()
+
+    def cleanup(self) -> int:
+        """Run the task if its interval has elapsed."""
+        now = time.monotonic()
+        if now - self._last_run < self.interval:
+            return 0
+        self._last_run = now
+        return self.func() or 0
+
+
 class CleanupManager:
     """Manages periodic cleanup of multiple data stores."""
 
@@ -151,19 +177,19 @@ class CleanupManager:
         Args:
             interval: Cleanup interval in seconds
         """
-        self.stores: list[DataStore] = []
+        self.stores: list[DataStore | PeriodicTask] = []
         self.interval = interval
         self._timer: threading.Timer | None = None
         self._running = False
         self._lock = threading.Lock()
 
-    def register(self, store: DataStore) -> None:
-        """Register a data store for cleanup."""
+    def register(self, store: DataStore | PeriodicTask) -> None:
+        """Register a data store (or periodic task) for cleanup."""
         with self._lock:
             if store not in self.stores:
                 self.stores.append(store)
 
-    def unregister(self, store: DataStore) -> None:
+    def unregister(self, store: DataStore | PeriodicTask) -> None:
         """Unregister a data store."""
         with self._lock:
             if store in self.stores:
@@ -92,6 +92,12 @@ MAX_BT_DEVICE_AGE_SECONDS = 300  # 5 minutes
 # ADS-B queue batch update interval
 ADSB_UPDATE_INTERVAL = 1.0  # seconds
 
+# Interval between SQLite maintenance passes (WAL checkpoint, optimize, pruning)
+DB_MAINTENANCE_INTERVAL_SECONDS = 300  # 5 minutes
+
+# Maximum age for persisted signal history readings
+SIGNAL_HISTORY_MAX_AGE_HOURS = 24
+
 
 # =============================================================================
 # QUEUE LIMITS
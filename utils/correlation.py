@@ -12,7 +12,7 @@ from dataclasses import dataclass
 from datetime import datetime, timedelta
 from typing import Any
 
-from utils.database import add_correlation, get_correlations as db_get_correlations
+from utils.database import add_correlations_bulk, get_correlations as db_get_correlations
 
 logger = logging.getLogger('intercept.correlation')
 
@@ -72,6 +72,7 @@ class DeviceCorrelator:
             List of correlation results with confidence scores
         """
         correlations = []
+        to_persist = []
 
         for wifi_mac, wifi_data in wifi_devices.items():
             wifi_obs = self._to_observation(wifi_mac, wifi_data, 'wifi')
@@ -97,18 +98,16 @@ class DeviceCorrelator:
 
                     # Persist high-confidence correlations
                     if confidence >= 0.7:
-                        try:
-                            add_correlation(
-                                wifi_mac=wifi_mac,
-                                bt_mac=bt_mac,
-                                confidence=confidence,
-                                metadata={
-                                    'wifi_name': wifi_obs.name,
-                                    'bt_name': bt_obs.name
-                                }
-                            )
-                        except Exception as e:
-                            logger.debug(f"Failed to persist correlation: {e}")
+                        to_persist.append((wifi_mac, bt_mac, confidence, {
+                            'wifi_name': wifi_obs.name,
+                            'bt_name': bt_obs.name
+                        }))
+
+        if to_persist:
+            try:
+                add_correlations_bulk(to_persist)
+            except Exception as e:
+                logger.debug(f"Failed to persist correlations: {e}")
 
         # Sort by confidence (highest first)
         correlations.sort(key=lambda x: x['confidence'], reverse=True)
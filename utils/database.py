@@ -4,26 +4,171 @@ SQLite database utilities for persistent settings storage.
 
 from __future__ import annotations
 
+import atexit
 import json
 import logging
 import sqlite3
 import threading
+import time
+import zlib
 from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
 from pathlib import Path
-from typing import Any
+from typing import Any, Callable, Iterator
 from werkzeug.security import generate_password_hash
 from config import ADMIN_USERNAME, ADMIN_PASSWORD
 
+try:
+    import orjson
+    ORJSON_AVAILABLE = True
+except ImportError:
+    orjson = None  # type: ignore
+    ORJSON_AVAILABLE = False
+
 logger = logging.getLogger('intercept.database')
 
 # Database file location
 DB_DIR = Path(__file__).parent.parent / 'instance'
 DB_PATH = DB_DIR / 'intercept.db'
 
-# Thread-local storage for connections
+# Schema version stored in PRAGMA user_version; bump on every schema change
+SCHEMA_VERSION = 13
+
+# Single shared writer connection, serialized by _writer_lock
+_writer_conn: sqlite3.Connection | None = None
+_writer_lock = threading.RLock()
+
+# Thread-local storage for read-only connections
 _local = threading.local()
 
+# Per-connection prepared statement cache size (sqlite3 default is 128)
+_CACHED_STATEMENTS = 256
+
+# Applied to every connection when it is opened
+_CONNECTION_PRAGMAS = (
+    'PRAGMA temp_store = MEMORY',
+    'PRAGMA mmap_size = 268435456',
+)
+
+# Applied to the writer only. WAL lets readers run alongside the writer, and
+# synchronous=NORMAL is durable against crashes in WAL mode (only a power
+# loss can drop the last commits). cache_size is negative KiB (64 MiB).
+_WRITER_PRAGMAS = (
+    'PRAGMA journal_mode = WAL',
+    'PRAGMA synchronous = NORMAL',
+    'PRAGMA cache_size = -65536',
+    'PRAGMA wal_autocheckpoint = 1000',
+    'PRAGMA foreign_keys = ON',
+)
+
+
+@lru_cache(maxsize=256)
+def _select_sql(
+    table: str,
+    conditions: tuple[str, ...],
+    suffix: str,
+    columns: tuple[str, ...] = ()
+) -> str:
+    """
+    Build a filtered SELECT once per filter combination.
+
+    Returning the identical string for the same combination keeps the
+    per-connection prepared statement cache hitting. An empty columns
+    tuple selects every column.
+    """
+    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    column_list = ', '.join(columns) if columns else '*'
+    return f'SELECT {column_list} FROM {table} {where_clause} {suffix}'
+
+
+@lru_cache(maxsize=256)
+def _update_sql(table: str, assignments: tuple[str, ...]) -> str:
+    """Build an UPDATE by id once per combination of assigned columns."""
+    return f'UPDATE {table} SET {", ".join(assignments)} WHERE id = ?'
+
+
+def _rows_to_dicts(cursor: sqlite3.Cursor) -> list[dict]:
+    """Convert a cursor's remaining rows to dicts, reading column names once."""
+    columns = [column[0] for column in cursor.description]
+    return [dict(zip(columns, row)) for row in cursor]
+
+
+def _decode_row(
+    row: sqlite3.Row,
+    json_columns: tuple[str, ...] = (),
+    bool_columns: tuple[str, ...] = ()
+) -> dict:
+    """Copy a row to a dict in one C-level call, then decode the typed columns."""
+    result = dict(row)
+    for col in json_columns:
+        result[col] = _loads(result[col]) if result[col] else None
+    for col in bool_columns:
+        result[col] = bool(result[col])
+    return result
+
+
+def _timestamp_cutoff(hours: float) -> str:
+    """
+    Return the UTC time `hours` ago in CURRENT_TIMESTAMP format.
+
+    Bound as a plain parameter so the comparison can range-scan an index on
+    the timestamp column.
+    """
+    return time.strftime('%Y-%m-%d %H:%M:%S', time.gmtime(time.time() - hours * 3600))
+
+
+# INSERT ... RETURNING needs SQLite 3.35+; older system libraries use lastrowid
+_HAS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+
+def _insert_returning_id(conn: sqlite3.Connection, sql: str, params: tuple) -> int:
+    """
+    Run an INSERT and return the id of the row it wrote.
+
+    With RETURNING this is also correct for upserts that resolve to an
+    UPDATE, where lastrowid does not identify the affected row.
+    """
+    if _HAS_RETURNING:
+        return conn.execute(f'{sql} RETURNING id', params).fetchone()[0]
+    return conn.execute(sql, params).lastrowid
+
+
+# Short-lived results for dashboard polling: key -> (expires_at, value).
+# Per-name generation counters stop a query that raced a write from caching
+# its pre-write result.
+_query_cache: dict[tuple, tuple[float, Any]] = {}
+_query_cache_generations: dict[str, int] = {}
+_query_cache_lock = threading.Lock()
+
+
+def _cached(key: tuple, ttl: float, fn: Callable[[], Any]) -> Any:
+    """
+    Return fn() from the query cache while the entry is younger than ttl.
+
+    Concurrent misses may each call fn(); the last result stored wins. A
+    result is not stored if key[0] was invalidated while fn() ran.
+    """
+    now = time.monotonic()
+    with _query_cache_lock:
+        entry = _query_cache.get(key)
+        if entry is not None and entry[0] > now:
+            return entry[1]
+        generation = _query_cache_generations.get(key[0], 0)
+    value = fn()
+    with _query_cache_lock:
+        if generation == _query_cache_generations.get(key[0], 0):
+            _query_cache[key] = (now + ttl, value)
+    return value
+
+
+def _invalidate_cached(name: str) -> None:
+    """Drop every cached entry whose key starts with name."""
+    with _query_cache_lock:
+        _query_cache_generations[name] = _query_cache_generations.get(name, 0) + 1
+        for key in [k for k in _query_cache if k[0] == name]:
+            del _query_cache[key]
+
 
 def get_db_path() -> Path:
     """Get the database file path, creating directory if needed."""
@@ -32,26 +177,195 @@ def get_db_path() -> Path:
 
 
 def get_connection() -> sqlite3.Connection:
-    """Get a thread-local database connection."""
-    if not hasattr(_local, 'connection') or _local.connection is None:
-        db_path = get_db_path()
-        _local.connection = sqlite3.connect(str(db_path), check_same_thread=False)
-        _local.connection.row_factory = sqlite3.Row
-        # Enable foreign keys
-        _local.connection.execute('PRAGMA foreign_keys = ON')
-    return _local.connection
+    """Get the shared writer connection."""
+    global _writer_conn
+    with _writer_lock:
+        if _writer_conn is None:
+            db_path = get_db_path()
+            # Shared across threads; every use is serialized by _writer_lock
+            # isolation_level=None: transactions are opened explicitly by get_db()
+            _writer_conn = sqlite3.connect(
+                str(db_path), check_same_thread=False, isolation_level=None,
+                cached_statements=_CACHED_STATEMENTS
+            )
+            _writer_conn.row_factory = sqlite3.Row
+            for pragma in _CONNECTION_PRAGMAS + _WRITER_PRAGMAS:
+                _writer_conn.execute(pragma)
+        return _writer_conn
+
+
+def get_read_connection() -> sqlite3.Connection:
+    """Get a thread-local read-only database connection."""
+    conn = getattr(_local, 'reader_conn', None)
+    if conn is None:
+        # The writer creates the database file if it does not exist yet
+        get_connection()
+        db_uri = f'{get_db_path().resolve().as_uri()}?mode=ro'
+        # Readers never leave their thread, so keep sqlite3's same-thread check
+        conn = sqlite3.connect(db_uri, uri=True, cached_statements=_CACHED_STATEMENTS)
+        conn.row_factory = sqlite3.Row
+        for pragma in _CONNECTION_PRAGMAS:
+            conn.execute(pragma)
+        _local.reader_conn = conn
+    return conn
 
 
 @contextmanager
 def get_db():
-    """Context manager for database operations."""
-    conn = get_connection()
+    """
+    Context manager for database write operations.
+
+    Opens a BEGIN IMMEDIATE transaction that is committed on exit and rolled
+    back on error. Nested use joins the transaction already in progress.
+    """
+    with _writer_lock:
+        conn = get_connection()
+        if conn.in_transaction:
+            yield conn
+            return
+        conn.execute('BEGIN IMMEDIATE')
+        try:
+            yield conn
+            conn.commit()
+        except Exception:
+            conn.rollback()
+            raise
+
+
+@contextmanager
+def get_db_read():
+    """Context manager for read-only database operations (never commits)."""
+    yield get_read_connection()
+
+
+@contextmanager
+def _db_read_snapshot():
+    """
+    Like get_db_read(), but every statement in the block reads one snapshot.
+
+    For results assembled from several SELECTs that have to agree with each
+    other; a write committed in between is either seen by all or by none.
+    """
+    conn = get_read_connection()
+    if conn.in_transaction:
+        yield conn
+        return
+    conn.execute('BEGIN')
     try:
         yield conn
-        conn.commit()
-    except Exception:
+    finally:
         conn.rollback()
-        raise
+
+
+@contextmanager
+def unsafe_fast_writes():
+    """
+    Context manager for bulk ingestion with synchronous=OFF on the writer.
+
+    Commits made inside the block skip fsync entirely, so an OS crash or
+    power loss can lose them or corrupt the database; only use it for data
+    that can be re-collected. The writer lock is held for the whole block
+    so writes from other threads never run unsynced, and synchronous=NORMAL
+    is restored on exit.
+    """
+    with _writer_lock:
+        conn = get_connection()
+        conn.execute('PRAGMA synchronous = OFF')
+        try:
+            yield conn
+        finally:
+            conn.execute('PRAGMA synchronous = NORMAL')
+
+
+def _rebuild_table(
+    conn: sqlite3.Connection,
+    table: str,
+    create_sql: str,
+    expressions: dict[str, str] | None = None
+) -> None:
+    """
+    Recreate a table from a new definition, keeping its rows.
+
+    Args:
+        conn: Open connection (inside a transaction)
+        table: Name of the existing table
+        create_sql: CREATE TABLE statement with a {table} placeholder
+        expressions: SQL to copy a column from instead of its old value,
+            for normalising data the new definition would reject
+
+    Columns are copied by name; rows the new definition rejects are dropped.
+    OR IGNORE does not cover FOREIGN KEY errors, so rows whose parent is
+    missing are filtered out of the copy instead.
+    """
+    tmp = f'{table}_rebuild'
+    conn.execute(f'DROP TABLE IF EXISTS {tmp}')
+    conn.execute(create_sql.format(table=tmp))
+    new_columns = {row['name'] for row in conn.execute(f'PRAGMA table_info({tmp})')}
+    names = [
+        row['name'] for row in conn.execute(f'PRAGMA table_info({table})')
+        if row['name'] in new_columns
+    ]
+    conditions = [
+        f"({fk['from']} IS NULL OR {fk['from']} IN "
+        f"(SELECT {fk['to'] or 'rowid'} FROM {fk['table']}))"
+        for fk in conn.execute(f'PRAGMA foreign_key_list({tmp})')
+        if fk['from'] in names
+    ]
+    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    values = ', '.join((expressions or {}).get(name, name) for name in names)
+    conn.execute(
+        f'INSERT OR IGNORE INTO {tmp} ({", ".join(names)}) '
+        f'SELECT {values} FROM {table} {where_clause}'
+    )
+    conn.execute(f'DROP TABLE {table}')
+    conn.execute(f'ALTER TABLE {tmp} RENAME TO {table}')
+
+
+def _create_or_rebuild_table(conn: sqlite3.Connection, table: str, create_sql: str) -> None:
+    """Create a WITHOUT ROWID table, rebuilding it if it exists as a rowid table."""
+    row = conn.execute(
+        "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = ?", (table,)
+    ).fetchone()
+    if row is None:
+        conn.execute(create_sql.format(table=table))
+    elif 'WITHOUT ROWID' not in row['sql'].upper():
+        logger.info(f"Rebuilding {table} as a WITHOUT ROWID table")
+        _rebuild_table(conn, table, create_sql)
+
+
+# Set once a user is known to exist, so logins skip the check afterwards
+_admin_user_ensured = False
+
+
+def ensure_admin_user() -> None:
+    """
+    Create the default admin user if there are no users yet.
+
+    Called on login rather than at schema init: the password hash is slow by
+    design, so it is computed outside any transaction and only when needed.
+    """
+    global _admin_user_ensured
+    if _admin_user_ensured:
+        return
+
+    with get_db_read() as conn:
+        has_users = conn.execute('SELECT 1 FROM users LIMIT 1').fetchone() is not None
+
+    if not has_users:
+        from config import ADMIN_USERNAME, ADMIN_PASSWORD
+
+        hashed_pw = generate_password_hash(ADMIN_PASSWORD)
+        with get_db() as conn:
+            # Re-checked here in case another request seeded it meanwhile
+            cursor = conn.execute('''
+                INSERT INTO users (username, password_hash, role)
+                SELECT ?, ?, ?
+                WHERE NOT EXISTS (SELECT 1 FROM users)
+            ''', (ADMIN_USERNAME, hashed_pw, 'admin'))
+        if cursor.rowcount:
+            logger.info(f"Created default admin user: {ADMIN_USERNAME}")
+
+    _admin_user_ensured = True
 
 
 def init_db() -> None:
@@ -59,7 +373,17 @@ def init_db() -> None:
     db_path = get_db_path()
     logger.info(f"Initializing database at {db_path}")
 
+    _init_schema()
+    _prime_settings_cache()
+
+
+def _init_schema() -> None:
+    """Create or migrate all tables, unless the schema is already current."""
     with get_db() as conn:
+        # Schema already current: skip re-running every CREATE statement
+        if conn.execute('PRAGMA user_version').fetchone()[0] == SCHEMA_VERSION:
+            return
+
         # Settings table for key-value storage
         conn.execute('''
             CREATE TABLE IF NOT EXISTS settings (
@@ -70,22 +394,48 @@ def init_db() -> None:
             )
         ''')
 
-        # Signal history table for graphs
+        # Booleans are stored as '1'/'0'; convert rows written as 'true'/'false'
         conn.execute('''
-            CREATE TABLE IF NOT EXISTS signal_history (
+            UPDATE settings
+            SET value = CASE WHEN lower(value) IN ('true', '1', 'yes') THEN '1' ELSE '0' END
+            WHERE value_type = 'bool' AND value NOT IN ('1', '0')
+        ''')
+
+        # Signal history table for graphs. Kept as a rowid table: reads are
+        # served index-only by idx_signal_history_cover, AUTOINCREMENT ids keep
+        # same-second readings ordered, and cleanup deletes in rowid batches.
+        # timestamp is Unix epoch seconds (compact, integer compares).
+        signal_history_sql = '''
+            CREATE TABLE IF NOT EXISTS {table} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 mode TEXT NOT NULL,
                 device_id TEXT NOT NULL,
                 signal_strength REAL,
-                timestamp TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                metadata TEXT
+                timestamp INTEGER DEFAULT (CAST(strftime('%s', 'now') AS INTEGER)),
+                metadata TEXT,
+                channel INTEGER,
+                frequency REAL
             )
-        ''')
+        '''
+        conn.execute(signal_history_sql.format(table='signal_history'))
+
+        # Older databases stored TEXT timestamps (and lacked channel/frequency)
+        columns = {row['name']: row['type'] for row in conn.execute('PRAGMA table_info(signal_history)')}
+        if columns['timestamp'] != 'INTEGER':
+            logger.info("Migrating signal_history timestamps to epoch seconds")
+            _rebuild_table(conn, 'signal_history', signal_history_sql)
+            conn.execute('''
+                UPDATE signal_history
+                SET timestamp = CAST(strftime('%s', timestamp) AS INTEGER)
+                WHERE typeof(timestamp) = 'text'
+            ''')
 
-        # Create index for faster queries
+        # Covering index for get_signal_history (no table lookups per row)
+        conn.execute('DROP INDEX IF EXISTS idx_signal_history_mode_device')
         conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_signal_history_mode_device
-            ON signal_history(mode, device_id, timestamp)
+            CREATE INDEX IF NOT EXISTS idx_signal_history_cover
+            ON signal_history(mode, device_id, timestamp DESC, id DESC,
+                              signal_strength, metadata, channel, frequency)
         ''')
 
         # Device correlation table
@@ -113,19 +463,6 @@ def init_db() -> None:
             )
         ''')
 
-        cursor = conn.execute('SELECT COUNT(*) FROM users')
-        if cursor.fetchone()[0] == 0:
-            from config import ADMIN_USERNAME, ADMIN_PASSWORD
-            
-            logger.info(f"Creating default admin user: {ADMIN_USERNAME}")
-            
-            # Password hashing
-            hashed_pw = generate_password_hash(ADMIN_PASSWORD)
-            
-            conn.execute('''
-                INSERT INTO users (username, password_hash, role)
-                VALUES (?, ?, ?)
-            ''', (ADMIN_USERNAME, hashed_pw, 'admin'))
         # =====================================================================
         # TSCM (Technical Surveillance Countermeasures) Tables
         # =====================================================================
@@ -221,11 +558,13 @@ def init_db() -> None:
             )
         ''')
 
-        # TSCM Known-Good Registry - Whitelist of expected devices
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS tscm_known_devices (
+        # TSCM Known-Good Registry - Whitelist of expected devices.
+        # Identifiers are stored upper-cased; the CHECK keeps that invariant
+        # so lookups can compare with plain equality on the UNIQUE index.
+        known_devices_sql = '''
+            CREATE TABLE IF NOT EXISTS {table} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
-                identifier TEXT NOT NULL UNIQUE,
+                identifier TEXT NOT NULL UNIQUE CHECK (identifier = UPPER(identifier)),
                 protocol TEXT NOT NULL,
                 name TEXT,
                 description TEXT,
@@ -237,7 +576,20 @@ def init_db() -> None:
                 score_modifier INTEGER DEFAULT -2,
                 metadata TEXT
             )
-        ''')
+        '''
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'tscm_known_devices'"
+        ).fetchone()
+        if row is not None and 'CHECK' not in row['sql'].upper():
+            logger.info("Rebuilding tscm_known_devices with upper-case identifier check")
+            # Normalise legacy identifiers rather than let the CHECK drop them;
+            # of two that differ only in case, one is kept
+            _rebuild_table(
+                conn, 'tscm_known_devices', known_devices_sql,
+                {'identifier': 'UPPER(identifier)'}
+            )
+        else:
+            conn.execute(known_devices_sql.format(table='tscm_known_devices'))
 
         # TSCM Cases - Grouping sweeps, threats, and notes
         conn.execute('''
@@ -259,27 +611,27 @@ def init_db() -> None:
         ''')
 
         # TSCM Case Sweeps - Link sweeps to cases
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS tscm_case_sweeps (
+        _create_or_rebuild_table(conn, 'tscm_case_sweeps', '''
+            CREATE TABLE {table} (
                 case_id INTEGER,
                 sweep_id INTEGER,
                 added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (case_id, sweep_id),
                 FOREIGN KEY (case_id) REFERENCES tscm_cases(id),
                 FOREIGN KEY (sweep_id) REFERENCES tscm_sweeps(id)
-            )
+            ) WITHOUT ROWID
         ''')
 
         # TSCM Case Threats - Link threats to cases
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS tscm_case_threats (
+        _create_or_rebuild_table(conn, 'tscm_case_threats', '''
+            CREATE TABLE {table} (
                 case_id INTEGER,
                 threat_id INTEGER,
                 added_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                 PRIMARY KEY (case_id, threat_id),
                 FOREIGN KEY (case_id) REFERENCES tscm_cases(id),
                 FOREIGN KEY (threat_id) REFERENCES tscm_threats(id)
-            )
+            ) WITHOUT ROWID
         ''')
 
         # TSCM Case Notes - Notes attached to cases
@@ -295,6 +647,21 @@ def init_db() -> None:
             )
         ''')
 
+        # Linking a sweep/threat or adding a note bumps the case's updated_at
+        for trigger, table in (
+            ('trg_case_sweeps_touch', 'tscm_case_sweeps'),
+            ('trg_case_threats_touch', 'tscm_case_threats'),
+            ('trg_case_notes_touch', 'tscm_case_notes'),
+        ):
+            conn.execute(f'''
+                CREATE TRIGGER IF NOT EXISTS {trigger}
+                AFTER INSERT ON {table}
+                BEGIN
+                    UPDATE tscm_cases SET updated_at = CURRENT_TIMESTAMP
+                    WHERE id = NEW.case_id;
+                END
+            ''')
+
         # TSCM Meeting Windows - Track sensitive periods
         conn.execute('''
             CREATE TABLE IF NOT EXISTS tscm_meeting_windows (
@@ -322,9 +689,28 @@ def init_db() -> None:
         ''')
 
         # TSCM indexes for performance
+        # Sweep filter ordered by detection time; supersedes the plain sweep_id index
+        conn.execute('DROP INDEX IF EXISTS idx_tscm_threats_sweep')
         conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_tscm_threats_sweep
-            ON tscm_threats(sweep_id)
+            CREATE INDEX IF NOT EXISTS idx_tscm_threats_sweep_time
+            ON tscm_threats(sweep_id, detected_at DESC)
+        ''')
+
+        # Unacknowledged threat summary. Partial, so it stays small as
+        # acknowledged history accumulates; the leading acknowledged column
+        # keeps it covering and preferred over the full indexes. Queries must
+        # compare acknowledged to a literal 0 to use it.
+        conn.execute('DROP INDEX IF EXISTS idx_tscm_threats_ack_severity')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_tscm_threats_unack
+            ON tscm_threats(acknowledged, severity)
+            WHERE acknowledged = 0
+        ''')
+
+        # Sweep and severity filter together, still in detection order
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_tscm_threats_sweep_severity_time
+            ON tscm_threats(sweep_id, severity, detected_at DESC)
         ''')
 
         conn.execute('''
@@ -342,11 +728,15 @@ def init_db() -> None:
             ON tscm_device_timelines(device_identifier, timestamp)
         ''')
 
+        # At most one baseline is active; keep the lookup off a table scan
         conn.execute('''
-            CREATE INDEX IF NOT EXISTS idx_tscm_known_devices_identifier
-            ON tscm_known_devices(identifier)
+            CREATE INDEX IF NOT EXISTS idx_tscm_baselines_active
+            ON tscm_baselines(is_active) WHERE is_active = 1
         ''')
 
+        # Redundant with the UNIQUE constraint's own index on identifier
+        conn.execute('DROP INDEX IF EXISTS idx_tscm_known_devices_identifier')
+
         conn.execute('''
             CREATE INDEX IF NOT EXISTS idx_tscm_cases_status
             ON tscm_cases(status, created_at)
@@ -513,6 +903,36 @@ def init_db() -> None:
             ON dsc_alerts(source_mmsi, received_at)
         ''')
 
+        # Category + acknowledgement filter, newest first
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_dsc_alerts_cat_ack_received
+            ON dsc_alerts(category, acknowledged, received_at DESC, id DESC)
+        ''')
+
+        # Acknowledgement filter: unacknowledged summary, acknowledged cleanup
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_dsc_alerts_ack_received
+            ON dsc_alerts(acknowledged, received_at DESC, id DESC)
+        ''')
+
+        # Unacknowledged per-category summary; partial and covering, like
+        # idx_tscm_threats_unack
+        conn.execute('DROP INDEX IF EXISTS idx_dsc_alerts_ack_cat')
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_dsc_alerts_unack
+            ON dsc_alerts(acknowledged, category)
+            WHERE acknowledged = 0
+        ''')
+
+        # Newest-first listing and keyset pagination on (received_at, id)
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_dsc_alerts_received
+            ON dsc_alerts(received_at DESC, id DESC)
+        ''')
+
+        # The open DISTRESS/URGENCY list is served by idx_dsc_alerts_cat_ack_received
+        conn.execute('DROP INDEX IF EXISTS idx_dsc_alerts_active_distress')
+
         # =====================================================================
         # Remote Agent Tables (for distributed/controller mode)
         # =====================================================================
@@ -534,18 +954,28 @@ def init_db() -> None:
             )
         ''')
 
-        # Push payloads received from remote agents
-        conn.execute('''
-            CREATE TABLE IF NOT EXISTS push_payloads (
+        # Push payloads received from remote agents. payload holds
+        # zlib-compressed JSON as a BLOB; older rows may still hold JSON TEXT.
+        # Deleting an agent cascades to its payloads via idx_push_payloads_agent.
+        push_payloads_sql = '''
+            CREATE TABLE IF NOT EXISTS {table} (
                 id INTEGER PRIMARY KEY AUTOINCREMENT,
                 agent_id INTEGER NOT NULL,
                 scan_type TEXT NOT NULL,
                 interface TEXT,
                 payload TEXT NOT NULL,
                 received_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-                FOREIGN KEY (agent_id) REFERENCES agents(id)
+                FOREIGN KEY (agent_id) REFERENCES agents(id) ON DELETE CASCADE
             )
-        ''')
+        '''
+        row = conn.execute(
+            "SELECT sql FROM sqlite_master WHERE type = 'table' AND name = 'push_payloads'"
+        ).fetchone()
+        if row is not None and 'CASCADE' not in row['sql'].upper():
+            logger.info("Rebuilding push_payloads with cascading agent deletes")
+            _rebuild_table(conn, 'push_payloads', push_payloads_sql)
+        else:
+            conn.execute(push_payloads_sql.format(table='push_payloads'))
 
         # Indexes for agent tables
         conn.execute('''
@@ -558,20 +988,170 @@ def init_db() -> None:
             ON push_payloads(agent_id, received_at)
         ''')
 
+        conn.execute('''
+            CREATE INDEX IF NOT EXISTS idx_push_payloads_received
+            ON push_payloads(received_at DESC, id DESC)
+        ''')
+
+        # Refresh planner statistics for any indexes created above
+        conn.execute('ANALYZE')
+        conn.execute(f'PRAGMA user_version = {SCHEMA_VERSION}')
+
         logger.info("Database initialized successfully")
 
 
 def close_db() -> None:
-    """Close the thread-local database connection."""
-    if hasattr(_local, 'connection') and _local.connection is not None:
-        _local.connection.close()
-        _local.connection = None
+    """Close the writer connection and this thread's reader connection."""
+    global _writer_conn, _admin_user_ensured
+    _admin_user_ensured = False
+    invalidate_settings_cache()
+    _known_device_cache_clear()
+    with _query_cache_lock:
+        _query_cache.clear()
+    reader = getattr(_local, 'reader_conn', None)
+    if reader is not None:
+        reader.close()
+        _local.reader_conn = None
+    with _writer_lock:
+        if _writer_conn is not None:
+            _writer_conn.close()
+            _writer_conn = None
+
+
+# Closing the writer last checkpoints the WAL and removes it on clean exit
+atexit.register(close_db)
+
+
+def run_maintenance() -> int:
+    """
+    Periodic housekeeping, run from the cleanup manager.
+
+    Prunes old signal history, refreshes query planner statistics and
+    checkpoints the WAL so it does not grow without bound.
+
+    Returns:
+        Number of signal history rows deleted
+    """
+    from utils.constants import SIGNAL_HISTORY_MAX_AGE_HOURS
+
+    deleted = cleanup_old_signal_history(SIGNAL_HISTORY_MAX_AGE_HOURS)
+    with _writer_lock:
+        conn = get_connection()
+        conn.execute('PRAGMA optimize')
+        conn.execute('PRAGMA wal_checkpoint(TRUNCATE)')
+    return deleted
+
+
+# =============================================================================
+# JSON Encoding
+# =============================================================================
+
+def _dumps(value: Any) -> str:
+    """
+    Encode a value as JSON text, using orjson when it is installed.
+
+    Values are stored as TEXT rather than orjson's raw bytes, so existing
+    rows and new ones share one type and SQLite's JSON functions can read them.
+    """
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.dumps(value, option=orjson.OPT_NON_STR_KEYS).decode()
+        except TypeError:
+            pass  # Fall back to json for anything orjson refuses
+    return json.dumps(value)
+
+
+def _loads(text: str | bytes) -> Any:
+    """Decode JSON text, using orjson when it is installed."""
+    if ORJSON_AVAILABLE:
+        try:
+            return orjson.loads(text)
+        except orjson.JSONDecodeError:
+            pass  # Values json accepts but orjson rejects (e.g. NaN)
+    return json.loads(text)
+
+
+def _compress_payload(value: Any) -> bytes:
+    """Encode a push payload as zlib-compressed JSON for BLOB storage."""
+    return zlib.compress(_dumps(value).encode(), 6)
+
+
+def _decompress_payload(stored: str | bytes) -> Any:
+    """Decode a stored push payload; rows written before compression are TEXT."""
+    if isinstance(stored, bytes):
+        stored = zlib.decompress(stored)
+    return _loads(stored)
 
 
 # =============================================================================
 # Settings Functions
 # =============================================================================
 
+# In-process settings cache: key -> (value, value_type) as stored, or None
+# when the key is known to be absent. Kept write-through by set_setting() and
+# delete_setting(); call invalidate_settings_cache() after external writes.
+_settings_cache: dict[str, tuple[str, str] | None] = {}
+_settings_cache_complete = False
+_settings_cache_generation = 0
+_settings_lock = threading.RLock()
+
+
+def _cache_setting(key: str, entry: tuple[str, str] | None) -> None:
+    """Write-through update of a cached setting."""
+    global _settings_cache_generation
+    with _settings_lock:
+        _settings_cache[key] = entry
+        _settings_cache_generation += 1
+
+
+def _prime_settings_cache() -> None:
+    """Load every stored setting into the cache with one query."""
+    global _settings_cache_complete
+    with _settings_lock:
+        generation = _settings_cache_generation
+    with get_db_read() as conn:
+        rows = conn.execute('SELECT key, value, value_type FROM settings').fetchall()
+    with _settings_lock:
+        if generation == _settings_cache_generation:
+            _settings_cache.clear()
+            _settings_cache.update(
+                (row['key'], (row['value'], row['value_type'])) for row in rows
+            )
+            _settings_cache_complete = True
+
+
+def invalidate_settings_cache() -> None:
+    """Drop cached settings so the next read goes back to the database."""
+    global _settings_cache_complete, _settings_cache_generation
+    with _settings_lock:
+        _settings_cache.clear()
+        _settings_cache_complete = False
+        _settings_cache_generation += 1
+
+
+def _get_setting_entry(key: str) -> tuple[str, str] | None:
+    """Get the stored (value, value_type) for a key, via the cache."""
+    with _settings_lock:
+        if key in _settings_cache:
+            return _settings_cache[key]
+        if _settings_cache_complete:
+            return None
+        generation = _settings_cache_generation
+
+    with get_db_read() as conn:
+        row = conn.execute(
+            'SELECT value, value_type FROM settings WHERE key = ?',
+            (key,)
+        ).fetchone()
+    entry = (row['value'], row['value_type']) if row is not None else None
+
+    with _settings_lock:
+        # Don't cache a value read before a concurrent write landed
+        if generation == _settings_cache_generation:
+            _settings_cache[key] = entry
+    return entry
+
+
 def get_setting(key: str, default: Any = None) -> Any:
     """
     Get a setting value by key.
@@ -583,32 +1163,52 @@ def get_setting(key: str, default: Any = None) -> Any:
     Returns:
         Setting value (auto-converted from JSON for complex types)
     """
-    with get_db() as conn:
-        cursor = conn.execute(
-            'SELECT value, value_type FROM settings WHERE key = ?',
-            (key,)
-        )
-        row = cursor.fetchone()
+    entry = _get_setting_entry(key)
+    if entry is None:
+        return default
 
-        if row is None:
-            return default
-
-        value, value_type = row['value'], row['value_type']
-
-        # Convert based on type
-        if value_type == 'json':
-            try:
-                return json.loads(value)
-            except json.JSONDecodeError:
-                return default
-        elif value_type == 'int':
-            return int(value)
-        elif value_type == 'float':
-            return float(value)
-        elif value_type == 'bool':
-            return value.lower() in ('true', '1', 'yes')
-        else:
-            return value
+    try:
+        return _decode_setting(*entry)
+    except json.JSONDecodeError:
+        return default
+
+
+# value_type -> decoder; unknown types (including 'string') pass through
+_SETTING_DECODERS: dict[str, Callable[[str], Any]] = {
+    'json': _loads,
+    'int': int,
+    'float': float,
+    'bool': lambda value: value == '1',
+}
+
+
+def _decode_setting(value: str, value_type: str) -> Any:
+    """Convert a stored setting back to its Python value based on its type."""
+    decoder = _SETTING_DECODERS.get(value_type)
+    return decoder(value) if decoder is not None else value
+
+
+# Python type -> (value_type, encoder); bool must precede int for subclass lookup
+_SETTING_ENCODERS: dict[type, tuple[str, Callable[[Any], str]]] = {
+    bool: ('bool', lambda value: '1' if value else '0'),
+    int: ('int', str),
+    float: ('float', str),
+    dict: ('json', _dumps),
+    list: ('json', _dumps),
+}
+
+
+def _encode_setting(value: Any) -> tuple[str, str]:
+    """Get the (value_type, stored text) pair for a setting value."""
+    entry = _SETTING_ENCODERS.get(type(value))
+    if entry is None:
+        # Subclasses (OrderedDict, IntEnum, ...) fall back to an isinstance scan
+        entry = next(
+            (enc for typ, enc in _SETTING_ENCODERS.items() if isinstance(value, typ)),
+            ('string', str)
+        )
+    value_type, encoder = entry
+    return value_type, encoder(value)
 
 
 def set_setting(key: str, value: Any) -> None:
@@ -619,22 +1219,7 @@ def set_setting(key: str, value: Any) -> None:
         key: Setting key
         value: Setting value (will be JSON-encoded for complex types)
     """
-    # Determine value type and string representation
-    if isinstance(value, bool):
-        value_type = 'bool'
-        str_value = 'true' if value else 'false'
-    elif isinstance(value, int):
-        value_type = 'int'
-        str_value = str(value)
-    elif isinstance(value, float):
-        value_type = 'float'
-        str_value = str(value)
-    elif isinstance(value, (dict, list)):
-        value_type = 'json'
-        str_value = json.dumps(value)
-    else:
-        value_type = 'string'
-        str_value = str(value)
+    value_type, str_value = _encode_setting(value)
 
     with get_db() as conn:
         conn.execute('''
@@ -645,6 +1230,7 @@ def set_setting(key: str, value: Any) -> None:
                 value_type = excluded.value_type,
                 updated_at = CURRENT_TIMESTAMP
         ''', (key, str_value, value_type))
+    _cache_setting(key, (str_value, value_type))
 
 
 def delete_setting(key: str) -> bool:
@@ -659,39 +1245,75 @@ def delete_setting(key: str) -> bool:
     """
     with get_db() as conn:
         cursor = conn.execute('DELETE FROM settings WHERE key = ?', (key,))
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+    _cache_setting(key, None)
+    return deleted
 
 
 def get_all_settings() -> dict[str, Any]:
-    """Get all settings as a dictionary."""
-    with get_db() as conn:
-        cursor = conn.execute('SELECT key, value, value_type FROM settings')
-        settings = {}
+    """Get all settings as a dictionary, from the cache once it is primed."""
+    with _settings_lock:
+        complete = _settings_cache_complete
+    if not complete:
+        _prime_settings_cache()
+
+    with _settings_lock:
+        if _settings_cache_complete:
+            entries = [(key, entry) for key, entry in _settings_cache.items() if entry]
+        else:
+            entries = None
 
-        for row in cursor:
-            key, value, value_type = row['key'], row['value'], row['value_type']
-
-            if value_type == 'json':
-                try:
-                    settings[key] = json.loads(value)
-                except json.JSONDecodeError:
-                    settings[key] = value
-            elif value_type == 'int':
-                settings[key] = int(value)
-            elif value_type == 'float':
-                settings[key] = float(value)
-            elif value_type == 'bool':
-                settings[key] = value.lower() in ('true', '1', 'yes')
-            else:
-                settings[key] = value
+    if entries is None:
+        # A concurrent write raced the priming; read this snapshot directly
+        with get_db_read() as conn:
+            rows = conn.execute('SELECT key, value, value_type FROM settings').fetchall()
+        entries = [(row['key'], (row['value'], row['value_type'])) for row in rows]
 
-        return settings
+    settings = {}
+    for key, (value, value_type) in entries:
+        try:
+            settings[key] = _decode_setting(value, value_type)
+        except json.JSONDecodeError:
+            settings[key] = value
+    return settings
 
 
 # =============================================================================
 # Signal History Functions
 # =============================================================================
 
+# Metadata keys stored in their own signal_history columns, with the types
+# each column accepts and the type it reads back as
+_SIGNAL_COLUMNS = {
+    'channel': ((int,), int),
+    'frequency': ((int, float), float),
+}
+
+
+def _split_signal_metadata(metadata: dict | None) -> tuple[dict, str | None]:
+    """
+    Copy typed column values out of metadata, JSON-encoding the rest.
+
+    A key is left out of the JSON only when get_signal_history() can put it
+    back exactly, with the same type and in the same position. Otherwise the
+    whole dict is encoded and the column just holds a copy.
+    """
+    columns = dict.fromkeys(_SIGNAL_COLUMNS)
+    if not metadata:
+        return columns, None
+    moved = []
+    for key, (accepted, stored) in _SIGNAL_COLUMNS.items():
+        value = metadata.get(key)
+        if isinstance(value, accepted) and not isinstance(value, bool):
+            columns[key] = value
+            if type(value) is stored:
+                moved.append(key)
+    extra = {key: value for key, value in metadata.items() if key not in moved}
+    if list(extra) + moved != list(metadata):
+        extra = metadata  # Merging the columns back would reorder the keys
+    return columns, _dumps(extra) if extra else None
+
+
 def add_signal_reading(
     mode: str,
     device_id: str,
@@ -699,11 +1321,36 @@ def add_signal_reading(
     metadata: dict | None = None
 ) -> None:
     """Add a signal strength reading."""
+    add_signal_readings_bulk([(mode, device_id, signal_strength, metadata)])
+
+
+def add_signal_readings_bulk(
+    readings: list[tuple[str, str, float, dict | None]]
+) -> None:
+    """
+    Add many signal strength readings in a single transaction.
+
+    Preferred over add_signal_reading() for scanners that report a sweep's
+    worth of devices at once: the rows go in with one executemany().
+
+    Args:
+        readings: (mode, device_id, signal_strength, metadata) tuples
+    """
+    prepared = []
+    for mode, device_id, signal_strength, metadata in readings:
+        columns, extra = _split_signal_metadata(metadata)
+        prepared.append((
+            mode, device_id, signal_strength, extra,
+            columns['channel'], columns['frequency']
+        ))
+    if not prepared:
+        return
     with get_db() as conn:
-        conn.execute('''
-            INSERT INTO signal_history (mode, device_id, signal_strength, metadata)
-            VALUES (?, ?, ?, ?)
-        ''', (mode, device_id, signal_strength, json.dumps(metadata) if metadata else None))
+        conn.executemany('''
+            INSERT INTO signal_history
+                (mode, device_id, signal_strength, metadata, channel, frequency)
+            VALUES (?, ?, ?, ?, ?, ?)
+        ''', prepared)
 
 
 def get_signal_history(
@@ -722,27 +1369,69 @@ def get_signal_history(
         since_minutes: Only get readings from last N minutes
 
     Returns:
-        List of signal readings with timestamp
+        List of signal readings with timestamp, oldest first
     """
-    with get_db() as conn:
+    with get_db_read() as conn:
+        # Newest N readings from the covering index, returned in chronological order
         cursor = conn.execute('''
-            SELECT signal_strength, timestamp, metadata
-            FROM signal_history
-            WHERE mode = ? AND device_id = ?
-              AND timestamp > datetime('now', ?)
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (mode, device_id, f'-{since_minutes} minutes', limit))
+            SELECT signal_strength, datetime(timestamp, 'unixepoch') AS timestamp,
+                   metadata, channel, frequency
+            FROM (
+                SELECT id, signal_strength, timestamp, metadata, channel, frequency
+                FROM signal_history
+                WHERE mode = ? AND device_id = ?
+                  AND timestamp > ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            )
+            ORDER BY timestamp, id
+        ''', (mode, device_id, int(time.time()) - since_minutes * 60, limit))
 
         results = []
         for row in cursor:
+            metadata = _loads(row['metadata']) if row['metadata'] else {}
+            for key in _SIGNAL_COLUMNS:
+                if row[key] is not None and key not in metadata:
+                    metadata[key] = row[key]
             results.append({
                 'signal': row['signal_strength'],
                 'timestamp': row['timestamp'],
-                'metadata': json.loads(row['metadata']) if row['metadata'] else None
+                'metadata': metadata or None
             })
 
-        return list(reversed(results))  # Return in chronological order
+        return results
+
+
+# Rows removed per transaction by the cleanup functions
+_CLEANUP_BATCH_SIZE = 10000
+
+
+def _delete_in_batches(
+    table: str,
+    condition: str,
+    params: tuple,
+    batch_size: int = _CLEANUP_BATCH_SIZE
+) -> int:
+    """
+    Delete the rows of table matching condition, batch_size rows at a time.
+
+    Each batch is its own short transaction so other writers can interleave
+    and the WAL stays bounded.
+
+    Returns:
+        Total number of rows deleted
+    """
+    sql = f'''
+        DELETE FROM {table}
+        WHERE rowid IN (SELECT rowid FROM {table} WHERE {condition} LIMIT ?)
+    '''
+    total = 0
+    while True:
+        with get_db() as conn:
+            deleted = conn.execute(sql, (*params, batch_size)).rowcount
+        total += deleted
+        if deleted < batch_size:
+            return total
 
 
 def cleanup_old_signal_history(max_age_hours: int = 24) -> int:
@@ -755,12 +1444,8 @@ def cleanup_old_signal_history(max_age_hours: int = 24) -> int:
     Returns:
         Number of deleted entries
     """
-    with get_db() as conn:
-        cursor = conn.execute('''
-            DELETE FROM signal_history
-            WHERE timestamp < datetime('now', ?)
-        ''', (f'-{max_age_hours} hours',))
-        return cursor.rowcount
+    cutoff = int(time.time()) - max_age_hours * 3600
+    return _delete_in_batches('signal_history', 'timestamp < ?', (cutoff,))
 
 
 # =============================================================================
@@ -774,20 +1459,37 @@ def add_correlation(
     metadata: dict | None = None
 ) -> None:
     """Add or update a device correlation."""
+    add_correlations_bulk([(wifi_mac, bt_mac, confidence, metadata)])
+
+
+def add_correlations_bulk(
+    correlations: list[tuple[str, str, float, dict | None]]
+) -> None:
+    """
+    Add or update many device correlations in a single transaction.
+
+    Args:
+        correlations: (wifi_mac, bt_mac, confidence, metadata) tuples
+    """
+    if not correlations:
+        return
     with get_db() as conn:
-        conn.execute('''
+        conn.executemany('''
             INSERT INTO device_correlations (wifi_mac, bt_mac, confidence, metadata, last_seen)
             VALUES (?, ?, ?, ?, CURRENT_TIMESTAMP)
             ON CONFLICT(wifi_mac, bt_mac) DO UPDATE SET
                 confidence = excluded.confidence,
                 last_seen = CURRENT_TIMESTAMP,
                 metadata = excluded.metadata
-        ''', (wifi_mac, bt_mac, confidence, json.dumps(metadata) if metadata else None))
+        ''', [
+            (wifi_mac, bt_mac, confidence, _dumps(metadata) if metadata else None)
+            for wifi_mac, bt_mac, confidence, metadata in correlations
+        ])
 
 
 def get_correlations(min_confidence: float = 0.5) -> list[dict]:
     """Get all device correlations above minimum confidence."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         cursor = conn.execute('''
             SELECT wifi_mac, bt_mac, confidence, first_seen, last_seen, metadata
             FROM device_correlations
@@ -803,7 +1505,7 @@ def get_correlations(min_confidence: float = 0.5) -> list[dict]:
                 'confidence': row['confidence'],
                 'first_seen': row['first_seen'],
                 'last_seen': row['last_seen'],
-                'metadata': json.loads(row['metadata']) if row['metadata'] else None
+                'metadata': _loads(row['metadata']) if row['metadata'] else None
             })
 
         return results
@@ -829,7 +1531,7 @@ def create_tscm_baseline(
         The ID of the created baseline
     """
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_baselines
             (name, location, description, wifi_networks, bt_devices, rf_frequencies, gps_coords)
             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -837,75 +1539,83 @@ def create_tscm_baseline(
             name,
             location,
             description,
-            json.dumps(wifi_networks) if wifi_networks else None,
-            json.dumps(bt_devices) if bt_devices else None,
-            json.dumps(rf_frequencies) if rf_frequencies else None,
-            json.dumps(gps_coords) if gps_coords else None
+            _dumps(wifi_networks) if wifi_networks else None,
+            _dumps(bt_devices) if bt_devices else None,
+            _dumps(rf_frequencies) if rf_frequencies else None,
+            _dumps(gps_coords) if gps_coords else None
         ))
-        return cursor.lastrowid
+
+
+# Columns of a baseline as returned to callers, in order
+_BASELINE_COLUMNS = (
+    'id', 'name', 'location', 'description', 'created_at', 'wifi_networks',
+    'bt_devices', 'rf_frequencies', 'gps_coords', 'is_active'
+)
+# JSON columns of tscm_baselines; the device lists default to [] when unset
+_BASELINE_LIST_COLUMNS = ('wifi_networks', 'bt_devices', 'rf_frequencies')
+_BASELINE_JSON_COLUMNS = _BASELINE_LIST_COLUMNS + ('gps_coords',)
+
+
+def _baseline_row_to_dict(row: sqlite3.Row) -> dict:
+    """Convert a tscm_baselines row to the API dict shape."""
+    baseline = _decode_row(row, _BASELINE_JSON_COLUMNS, ('is_active',))
+    for col in _BASELINE_LIST_COLUMNS:
+        if baseline[col] is None:
+            baseline[col] = []
+    return baseline
 
 
 def get_tscm_baseline(baseline_id: int) -> dict | None:
     """Get a specific TSCM baseline by ID."""
-    with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT * FROM tscm_baselines WHERE id = ?
-        ''', (baseline_id,))
+    with get_db_read() as conn:
+        cursor = conn.execute(
+            _select_sql('tscm_baselines', ('id = ?',), '', _BASELINE_COLUMNS), (baseline_id,)
+        )
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return {
-            'id': row['id'],
-            'name': row['name'],
-            'location': row['location'],
-            'description': row['description'],
-            'created_at': row['created_at'],
-            'wifi_networks': json.loads(row['wifi_networks']) if row['wifi_networks'] else [],
-            'bt_devices': json.loads(row['bt_devices']) if row['bt_devices'] else [],
-            'rf_frequencies': json.loads(row['rf_frequencies']) if row['rf_frequencies'] else [],
-            'gps_coords': json.loads(row['gps_coords']) if row['gps_coords'] else None,
-            'is_active': bool(row['is_active'])
-        }
+        return _baseline_row_to_dict(row)
 
 
 def get_all_tscm_baselines() -> list[dict]:
     """Get all TSCM baselines."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         cursor = conn.execute('''
             SELECT id, name, location, description, created_at, is_active
             FROM tscm_baselines
             ORDER BY created_at DESC
         ''')
 
-        return [dict(row) for row in cursor]
+        return _rows_to_dicts(cursor)
 
 
 def get_active_tscm_baseline() -> dict | None:
     """Get the currently active TSCM baseline."""
-    with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT * FROM tscm_baselines WHERE is_active = 1 LIMIT 1
-        ''')
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql(
+            'tscm_baselines', ('is_active = 1',), 'LIMIT 1', _BASELINE_COLUMNS
+        ))
         row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return get_tscm_baseline(row['id'])
+        return _baseline_row_to_dict(row)
 
 
 def set_active_tscm_baseline(baseline_id: int) -> bool:
     """Set a baseline as active (deactivates others)."""
     with get_db() as conn:
-        # Deactivate all
-        conn.execute('UPDATE tscm_baselines SET is_active = 0')
-        # Activate selected
-        cursor = conn.execute(
-            'UPDATE tscm_baselines SET is_active = 1 WHERE id = ?',
-            (baseline_id,)
-        )
+        # One pass touching only the previously active row and the selected
+        # one. Nothing changes if the baseline does not exist.
+        cursor = conn.execute('''
+            UPDATE tscm_baselines
+            SET is_active = CASE WHEN id = ? THEN 1 ELSE 0 END
+            WHERE (is_active = 1 OR id = ?)
+              AND EXISTS (SELECT 1 FROM tscm_baselines WHERE id = ?)
+        ''', (baseline_id, baseline_id, baseline_id))
         return cursor.rowcount > 0
 
 
@@ -921,13 +1631,13 @@ def update_tscm_baseline(
 
     if wifi_networks is not None:
         updates.append('wifi_networks = ?')
-        params.append(json.dumps(wifi_networks))
+        params.append(_dumps(wifi_networks))
     if bt_devices is not None:
         updates.append('bt_devices = ?')
-        params.append(json.dumps(bt_devices))
+        params.append(_dumps(bt_devices))
     if rf_frequencies is not None:
         updates.append('rf_frequencies = ?')
-        params.append(json.dumps(rf_frequencies))
+        params.append(_dumps(rf_frequencies))
 
     if not updates:
         return False
@@ -935,10 +1645,7 @@ def update_tscm_baseline(
     params.append(baseline_id)
 
     with get_db() as conn:
-        cursor = conn.execute(
-            f'UPDATE tscm_baselines SET {", ".join(updates)} WHERE id = ?',
-            params
-        )
+        cursor = conn.execute(_update_sql('tscm_baselines', tuple(updates)), params)
         return cursor.rowcount > 0
 
 
@@ -966,12 +1673,11 @@ def create_tscm_sweep(
         The ID of the created sweep
     """
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_sweeps
             (baseline_id, sweep_type, wifi_enabled, bt_enabled, rf_enabled)
             VALUES (?, ?, ?, ?, ?)
         ''', (baseline_id, sweep_type, wifi_enabled, bt_enabled, rf_enabled))
-        return cursor.lastrowid
 
 
 def update_tscm_sweep(
@@ -991,10 +1697,10 @@ def update_tscm_sweep(
         params.append(status)
     if results is not None:
         updates.append('results = ?')
-        params.append(json.dumps(results))
+        params.append(_dumps(results))
     if anomalies is not None:
         updates.append('anomalies = ?')
-        params.append(json.dumps(anomalies))
+        params.append(_dumps(anomalies))
     if threats_found is not None:
         updates.append('threats_found = ?')
         params.append(threats_found)
@@ -1007,36 +1713,43 @@ def update_tscm_sweep(
     params.append(sweep_id)
 
     with get_db() as conn:
-        cursor = conn.execute(
-            f'UPDATE tscm_sweeps SET {", ".join(updates)} WHERE id = ?',
-            params
-        )
+        cursor = conn.execute(_update_sql('tscm_sweeps', tuple(updates)), params)
         return cursor.rowcount > 0
 
 
-def get_tscm_sweep(sweep_id: int) -> dict | None:
-    """Get a specific TSCM sweep by ID."""
-    with get_db() as conn:
-        cursor = conn.execute('SELECT * FROM tscm_sweeps WHERE id = ?', (sweep_id,))
-        row = cursor.fetchone()
+# Scalar sweep columns, and the JSON payload columns only fetched on request
+_SWEEP_COLUMNS = (
+    'id', 'baseline_id', 'started_at', 'completed_at', 'status', 'sweep_type',
+    'wifi_enabled', 'bt_enabled', 'rf_enabled', 'threats_found'
+)
+_SWEEP_PAYLOAD_COLUMNS = ('results', 'anomalies')
+
+
+def get_tscm_sweep(sweep_id: int, include_payload: bool = True) -> dict | None:
+    """
+    Get a specific TSCM sweep by ID.
+
+    Args:
+        sweep_id: Sweep to fetch
+        include_payload: Fetch and decode the results and anomalies JSON;
+            False skips reading those columns
+    """
+    columns = _SWEEP_COLUMNS + (_SWEEP_PAYLOAD_COLUMNS if include_payload else ())
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql('tscm_sweeps', ('id = ?',), '', columns), (sweep_id,))
+        row = cursor.fetchone()
 
         if row is None:
             return None
 
-        return {
-            'id': row['id'],
-            'baseline_id': row['baseline_id'],
-            'started_at': row['started_at'],
-            'completed_at': row['completed_at'],
-            'status': row['status'],
-            'sweep_type': row['sweep_type'],
-            'wifi_enabled': bool(row['wifi_enabled']),
-            'bt_enabled': bool(row['bt_enabled']),
-            'rf_enabled': bool(row['rf_enabled']),
-            'results': json.loads(row['results']) if row['results'] else None,
-            'anomalies': json.loads(row['anomalies']) if row['anomalies'] else [],
-            'threats_found': row['threats_found']
-        }
+        sweep = _decode_row(
+            row,
+            _SWEEP_PAYLOAD_COLUMNS if include_payload else (),
+            ('wifi_enabled', 'bt_enabled', 'rf_enabled')
+        )
+        if include_payload and sweep['anomalies'] is None:
+            sweep['anomalies'] = []
+        return sweep
 
 
 def add_tscm_threat(
@@ -1057,19 +1770,54 @@ def add_tscm_threat(
     Returns:
         The ID of the created threat
     """
+    return add_tscm_threats_bulk(sweep_id, [{
+        'threat_type': threat_type,
+        'severity': severity,
+        'source': source,
+        'identifier': identifier,
+        'name': name,
+        'signal_strength': signal_strength,
+        'frequency': frequency,
+        'details': details,
+        'gps_coords': gps_coords,
+    }])[0]
+
+
+def add_tscm_threats_bulk(sweep_id: int, threats: list[dict]) -> list[int]:
+    """
+    Add many detected threats to a TSCM sweep in a single transaction.
+
+    Args:
+        sweep_id: Sweep the threats belong to
+        threats: Dicts keyed like add_tscm_threat()'s arguments
+
+    Returns:
+        IDs of the created threats, in input order
+    """
     with get_db() as conn:
-        cursor = conn.execute('''
-            INSERT INTO tscm_threats
-            (sweep_id, threat_type, severity, source, identifier, name,
-             signal_strength, frequency, details, gps_coords)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        ''', (
-            sweep_id, threat_type, severity, source, identifier, name,
-            signal_strength, frequency,
-            json.dumps(details) if details else None,
-            json.dumps(gps_coords) if gps_coords else None
-        ))
-        return cursor.lastrowid
+        return [
+            _insert_returning_id(conn, '''
+                INSERT INTO tscm_threats
+                (sweep_id, threat_type, severity, source, identifier, name,
+                 signal_strength, frequency, details, gps_coords)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', (
+                sweep_id, t['threat_type'], t['severity'], t['source'], t['identifier'],
+                t.get('name'), t.get('signal_strength'), t.get('frequency'),
+                _dumps(t['details']) if t.get('details') else None,
+                _dumps(t['gps_coords']) if t.get('gps_coords') else None
+            ))
+            for t in threats
+        ]
+
+
+# Columns of a threat as returned to callers, in order
+_THREAT_COLUMNS = (
+    'id', 'sweep_id', 'detected_at', 'threat_type', 'severity', 'source',
+    'identifier', 'name', 'signal_strength', 'frequency', 'details',
+    'acknowledged', 'notes', 'gps_coords'
+)
+_THREAT_JSON_COLUMNS = ('details', 'gps_coords')
 
 
 def get_tscm_threats(
@@ -1089,40 +1837,16 @@ def get_tscm_threats(
         conditions.append('severity = ?')
         params.append(severity)
     if acknowledged is not None:
-        conditions.append('acknowledged = ?')
-        params.append(1 if acknowledged else 0)
+        # Literal, so the partial idx_tscm_threats_unack can serve it
+        conditions.append('acknowledged = 1' if acknowledged else 'acknowledged = 0')
 
-    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
     params.append(limit)
 
-    with get_db() as conn:
-        cursor = conn.execute(f'''
-            SELECT * FROM tscm_threats
-            {where_clause}
-            ORDER BY detected_at DESC
-            LIMIT ?
-        ''', params)
-
-        results = []
-        for row in cursor:
-            results.append({
-                'id': row['id'],
-                'sweep_id': row['sweep_id'],
-                'detected_at': row['detected_at'],
-                'threat_type': row['threat_type'],
-                'severity': row['severity'],
-                'source': row['source'],
-                'identifier': row['identifier'],
-                'name': row['name'],
-                'signal_strength': row['signal_strength'],
-                'frequency': row['frequency'],
-                'details': json.loads(row['details']) if row['details'] else None,
-                'acknowledged': bool(row['acknowledged']),
-                'notes': row['notes'],
-                'gps_coords': json.loads(row['gps_coords']) if row['gps_coords'] else None
-            })
-
-        return results
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql(
+            'tscm_threats', tuple(conditions), 'ORDER BY detected_at DESC LIMIT ?', _THREAT_COLUMNS
+        ), params)
+        return [_decode_row(row, _THREAT_JSON_COLUMNS, ('acknowledged',)) for row in cursor]
 
 
 def acknowledge_tscm_threat(threat_id: int, notes: str | None = None) -> bool:
@@ -1142,21 +1866,19 @@ def acknowledge_tscm_threat(threat_id: int, notes: str | None = None) -> bool:
 
 
 def get_tscm_threat_summary() -> dict:
-    """Get summary counts of threats by severity."""
-    with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT severity, COUNT(*) as count
+    """Get summary counts of unacknowledged threats by severity."""
+    with get_db_read() as conn:
+        row = conn.execute('''
+            SELECT
+                COALESCE(SUM(severity = 'critical'), 0) AS critical,
+                COALESCE(SUM(severity = 'high'), 0) AS high,
+                COALESCE(SUM(severity = 'medium'), 0) AS medium,
+                COALESCE(SUM(severity = 'low'), 0) AS low,
+                COUNT(*) AS total
             FROM tscm_threats
             WHERE acknowledged = 0
-            GROUP BY severity
-        ''')
-
-        summary = {'critical': 0, 'high': 0, 'medium': 0, 'low': 0, 'total': 0}
-        for row in cursor:
-            summary[row['severity']] = row['count']
-            summary['total'] += row['count']
-
-        return summary
+        ''').fetchone()
+        return dict(row)
 
 
 # =============================================================================
@@ -1175,15 +1897,42 @@ def add_device_timeline_entry(
 ) -> int:
     """Add a device timeline observation entry."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_device_timelines
             (device_identifier, protocol, sweep_id, rssi, presence, channel, frequency, attributes)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?)
         ''', (
             device_identifier, protocol, sweep_id, rssi, presence,
-            channel, frequency, json.dumps(attributes) if attributes else None
+            channel, frequency, _dumps(attributes) if attributes else None
         ))
-        return cursor.lastrowid
+
+
+def add_device_timeline_entries_bulk(entries: list[dict]) -> None:
+    """
+    Add many device timeline observations in a single transaction.
+
+    Args:
+        entries: Dicts keyed like add_device_timeline_entry()'s arguments
+    """
+    if not entries:
+        return
+    with get_db() as conn:
+        conn.executemany('''
+            INSERT INTO tscm_device_timelines
+            (device_identifier, protocol, sweep_id, rssi, presence, channel, frequency, attributes)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+        ''', [(
+            e['device_identifier'], e['protocol'], e.get('sweep_id'), e.get('rssi'),
+            e.get('presence', True), e.get('channel'), e.get('frequency'),
+            _dumps(e['attributes']) if e.get('attributes') else None
+        ) for e in entries])
+
+
+# Columns of a timeline entry as returned to callers, in order
+_TIMELINE_COLUMNS = (
+    'id', 'device_identifier', 'protocol', 'sweep_id', 'timestamp', 'rssi',
+    'presence', 'channel', 'frequency', 'attributes'
+)
 
 
 def get_device_timeline(
@@ -1192,30 +1941,19 @@ def get_device_timeline(
     since_hours: int = 24
 ) -> list[dict]:
     """Get timeline entries for a device."""
-    with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT * FROM tscm_device_timelines
-            WHERE device_identifier = ?
-              AND timestamp > datetime('now', ?)
-            ORDER BY timestamp DESC
-            LIMIT ?
-        ''', (device_identifier, f'-{since_hours} hours', limit))
-
-        results = []
-        for row in cursor:
-            results.append({
-                'id': row['id'],
-                'device_identifier': row['device_identifier'],
-                'protocol': row['protocol'],
-                'sweep_id': row['sweep_id'],
-                'timestamp': row['timestamp'],
-                'rssi': row['rssi'],
-                'presence': bool(row['presence']),
-                'channel': row['channel'],
-                'frequency': row['frequency'],
-                'attributes': json.loads(row['attributes']) if row['attributes'] else None
-            })
-        return list(reversed(results))
+    with get_db_read() as conn:
+        # Newest `limit` entries, returned oldest first
+        cursor = conn.execute(f'''
+            SELECT {', '.join(_TIMELINE_COLUMNS)} FROM (
+                SELECT * FROM tscm_device_timelines
+                WHERE device_identifier = ?
+                  AND timestamp > ?
+                ORDER BY timestamp DESC, id DESC
+                LIMIT ?
+            )
+            ORDER BY timestamp, id
+        ''', (device_identifier, _timestamp_cutoff(since_hours), limit))
+        return [_decode_row(row, ('attributes',), ('presence',)) for row in cursor]
 
 
 def cleanup_old_timeline_entries(max_age_hours: int = 72) -> int:
@@ -1223,8 +1961,8 @@ def cleanup_old_timeline_entries(max_age_hours: int = 72) -> int:
     with get_db() as conn:
         cursor = conn.execute('''
             DELETE FROM tscm_device_timelines
-            WHERE timestamp < datetime('now', ?)
-        ''', (f'-{max_age_hours} hours',))
+            WHERE timestamp < ?
+        ''', (_timestamp_cutoff(max_age_hours),))
         return cursor.rowcount
 
 
@@ -1245,7 +1983,7 @@ def add_known_device(
 ) -> int:
     """Add a device to the known-good registry."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        device_id = _insert_returning_id(conn, '''
             INSERT INTO tscm_known_devices
             (identifier, protocol, name, description, location, scope, added_by, score_modifier, metadata)
             VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
@@ -1259,42 +1997,87 @@ def add_known_device(
                 last_verified = CURRENT_TIMESTAMP
         ''', (
             identifier.upper(), protocol, name, description, location,
-            scope, added_by, score_modifier, json.dumps(metadata) if metadata else None
+            scope, added_by, score_modifier, _dumps(metadata) if metadata else None
         ))
-        return cursor.lastrowid
+    _known_device_cache_clear()
+    return device_id
+
+
+# Columns of a registry row as cached and returned, in order
+_KNOWN_DEVICE_COLUMNS = (
+    'id', 'identifier', 'protocol', 'name', 'description', 'location', 'scope',
+    'added_at', 'added_by', 'last_verified', 'score_modifier', 'metadata'
+)
+
+
+# Whole registry keyed by identifier, loaded on first lookup. It is small and
+# changes rarely, so sweeps check every scanned device without a query; the
+# generation counter stops a load that raced a registry write from caching
+# the stale snapshot.
+_known_devices: dict[str, tuple] | None = None
+_known_devices_generation = 0
+_known_devices_lock = threading.Lock()
+
+
+def _known_device_registry() -> dict[str, tuple]:
+    """Get the cached registry, loading it from the database if needed."""
+    global _known_devices
+    registry = _known_devices
+    if registry is not None:
+        return registry
+    with _known_devices_lock:
+        generation = _known_devices_generation
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql('tscm_known_devices', (), '', _KNOWN_DEVICE_COLUMNS))
+        registry = {row['identifier']: tuple(row) for row in cursor}
+    with _known_devices_lock:
+        if generation == _known_devices_generation:
+            _known_devices = registry
+    return registry
+
+
+_KNOWN_DEVICE_LOCATION = _KNOWN_DEVICE_COLUMNS.index('location')
+_KNOWN_DEVICE_SCOPE = _KNOWN_DEVICE_COLUMNS.index('scope')
+
+
+def _lookup_known_device(identifier: str, location: str | None) -> tuple | None:
+    """Registry row for identifier, restricted to location or global scope if given."""
+    row = _known_device_registry().get(identifier.upper())
+    if row is None or not location:
+        return row
+    if row[_KNOWN_DEVICE_LOCATION] == location or row[_KNOWN_DEVICE_SCOPE] == 'global':
+        return row
+    return None
+
+
+def _known_device_cache_clear() -> None:
+    """Invalidate the cached registry after it changes."""
+    global _known_devices, _known_devices_generation
+    with _known_devices_lock:
+        _known_devices = None
+        _known_devices_generation += 1
 
 
 def get_known_device(identifier: str) -> dict | None:
     """Get a known device by identifier."""
-    with get_db() as conn:
-        cursor = conn.execute(
-            'SELECT * FROM tscm_known_devices WHERE identifier = ?',
-            (identifier.upper(),)
-        )
-        row = cursor.fetchone()
-        if not row:
-            return None
-        return {
-            'id': row['id'],
-            'identifier': row['identifier'],
-            'protocol': row['protocol'],
-            'name': row['name'],
-            'description': row['description'],
-            'location': row['location'],
-            'scope': row['scope'],
-            'added_at': row['added_at'],
-            'added_by': row['added_by'],
-            'last_verified': row['last_verified'],
-            'score_modifier': row['score_modifier'],
-            'metadata': json.loads(row['metadata']) if row['metadata'] else None
-        }
+    row = _lookup_known_device(identifier, None)
+    if not row:
+        return None
+    device = dict(zip(_KNOWN_DEVICE_COLUMNS, row))
+    device['metadata'] = _loads(device['metadata']) if device['metadata'] else None
+    return device
 
 
-def get_all_known_devices(
+def iter_known_devices(
     location: str | None = None,
     scope: str | None = None
-) -> list[dict]:
-    """Get all known devices, optionally filtered by location or scope."""
+) -> Iterator[dict]:
+    """
+    Yield known devices, newest first, optionally filtered by location or scope.
+
+    Rows are decoded as the consumer reaches them, so scans over a large
+    registry never hold it all in memory.
+    """
     conditions = []
     params = []
 
@@ -1305,32 +2088,22 @@ def get_all_known_devices(
         conditions.append('scope = ?')
         params.append(scope)
 
-    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql(
+            'tscm_known_devices', tuple(conditions), 'ORDER BY added_at DESC',
+            _KNOWN_DEVICE_COLUMNS
+        ), params)
 
-    with get_db() as conn:
-        cursor = conn.execute(f'''
-            SELECT * FROM tscm_known_devices
-            {where_clause}
-            ORDER BY added_at DESC
-        ''', params)
+        for row in cursor:
+            yield _decode_row(row, ('metadata',))
 
-        return [
-            {
-                'id': row['id'],
-                'identifier': row['identifier'],
-                'protocol': row['protocol'],
-                'name': row['name'],
-                'description': row['description'],
-                'location': row['location'],
-                'scope': row['scope'],
-                'added_at': row['added_at'],
-                'added_by': row['added_by'],
-                'last_verified': row['last_verified'],
-                'score_modifier': row['score_modifier'],
-                'metadata': json.loads(row['metadata']) if row['metadata'] else None
-            }
-            for row in cursor
-        ]
+
+def get_all_known_devices(
+    location: str | None = None,
+    scope: str | None = None
+) -> list[dict]:
+    """Get all known devices as a list; see iter_known_devices()."""
+    return list(iter_known_devices(location, scope))
 
 
 def delete_known_device(identifier: str) -> bool:
@@ -1340,7 +2113,9 @@ def delete_known_device(identifier: str) -> bool:
             'DELETE FROM tscm_known_devices WHERE identifier = ?',
             (identifier.upper(),)
         )
-        return cursor.rowcount > 0
+        deleted = cursor.rowcount > 0
+    _known_device_cache_clear()
+    return deleted
 
 
 # =============================================================================
@@ -1361,7 +2136,7 @@ def create_tscm_schedule(
 ) -> int:
     """Create a new TSCM sweep schedule."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_schedules
             (name, baseline_id, zone_name, cron_expression, sweep_type,
              enabled, last_run, next_run, notify_on_threat, notify_email)
@@ -1378,12 +2153,11 @@ def create_tscm_schedule(
             1 if notify_on_threat else 0,
             notify_email,
         ))
-        return cursor.lastrowid
 
 
 def get_tscm_schedule(schedule_id: int) -> dict | None:
     """Get a TSCM schedule by ID."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         cursor = conn.execute(
             'SELECT * FROM tscm_schedules WHERE id = ?',
             (schedule_id,)
@@ -1404,17 +2178,13 @@ def get_all_tscm_schedules(
         conditions.append('enabled = ?')
         params.append(1 if enabled else 0)
 
-    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
     params.append(limit)
 
-    with get_db() as conn:
-        cursor = conn.execute(f'''
-            SELECT * FROM tscm_schedules
-            {where_clause}
-            ORDER BY id DESC
-            LIMIT ?
-        ''', params)
-        return [dict(row) for row in cursor]
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql(
+            'tscm_schedules', tuple(conditions), 'ORDER BY id DESC LIMIT ?'
+        ), params)
+        return _rows_to_dicts(cursor)
 
 
 def update_tscm_schedule(schedule_id: int, **fields) -> bool:
@@ -1422,18 +2192,14 @@ def update_tscm_schedule(schedule_id: int, **fields) -> bool:
     if not fields:
         return False
 
-    updates = []
-    params = []
-
-    for key, value in fields.items():
-        updates.append(f'{key} = ?')
-        params.append(value)
-
+    # Sorted so the same set of fields always yields the same statement
+    keys = sorted(fields)
+    params = [fields[key] for key in keys]
     params.append(schedule_id)
 
     with get_db() as conn:
         cursor = conn.execute(
-            f'UPDATE tscm_schedules SET {", ".join(updates)} WHERE id = ?',
+            _update_sql('tscm_schedules', tuple(f'{key} = ?' for key in keys)),
             params
         )
         return cursor.rowcount > 0
@@ -1451,26 +2217,16 @@ def delete_tscm_schedule(schedule_id: int) -> bool:
 
 def is_known_good_device(identifier: str, location: str | None = None) -> dict | None:
     """Check if a device is in the known-good registry for a location."""
-    with get_db() as conn:
-        if location:
-            cursor = conn.execute('''
-                SELECT * FROM tscm_known_devices
-                WHERE identifier = ? AND (location = ? OR scope = 'global')
-            ''', (identifier.upper(), location))
-        else:
-            cursor = conn.execute(
-                'SELECT * FROM tscm_known_devices WHERE identifier = ?',
-                (identifier.upper(),)
-            )
-        row = cursor.fetchone()
-        if not row:
-            return None
-        return {
-            'identifier': row['identifier'],
-            'name': row['name'],
-            'score_modifier': row['score_modifier'],
-            'scope': row['scope']
-        }
+    row = _lookup_known_device(identifier, location or None)
+    if not row:
+        return None
+    device = dict(zip(_KNOWN_DEVICE_COLUMNS, row))
+    return {
+        'identifier': device['identifier'],
+        'name': device['name'],
+        'score_modifier': device['score_modifier'],
+        'scope': device['scope']
+    }
 
 
 # =============================================================================
@@ -1487,76 +2243,136 @@ def create_tscm_case(
 ) -> int:
     """Create a new TSCM case."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_cases
             (name, description, location, priority, created_by, metadata)
             VALUES (?, ?, ?, ?, ?, ?)
         ''', (name, description, location, priority, created_by,
-              json.dumps(metadata) if metadata else None))
-        return cursor.lastrowid
+              _dumps(metadata) if metadata else None))
 
 
-def get_tscm_case(case_id: int) -> dict | None:
-    """Get a TSCM case by ID."""
-    with get_db() as conn:
-        cursor = conn.execute('SELECT * FROM tscm_cases WHERE id = ?', (case_id,))
-        row = cursor.fetchone()
-        if not row:
-            return None
+_CASE_NOTE_COLUMNS = (
+    'id', 'case_id', 'content', 'note_type', 'created_at', 'created_by'
+)
 
-        case = {
-            'id': row['id'],
-            'name': row['name'],
-            'description': row['description'],
-            'location': row['location'],
-            'status': row['status'],
-            'priority': row['priority'],
-            'created_at': row['created_at'],
-            'updated_at': row['updated_at'],
-            'closed_at': row['closed_at'],
-            'created_by': row['created_by'],
-            'assigned_to': row['assigned_to'],
-            'notes': row['notes'],
-            'metadata': json.loads(row['metadata']) if row['metadata'] else None,
-            'sweeps': [],
-            'threats': [],
-            'case_notes': []
-        }
 
-        # Get linked sweeps
-        cursor = conn.execute('''
-            SELECT s.* FROM tscm_sweeps s
-            JOIN tscm_case_sweeps cs ON s.id = cs.sweep_id
-            WHERE cs.case_id = ?
-            ORDER BY s.started_at DESC
-        ''', (case_id,))
-        case['sweeps'] = [dict(row) for row in cursor]
+@lru_cache(maxsize=4)
+def _tscm_case_sql(include_payload: bool, many: bool = False) -> tuple[str, ...]:
+    """
+    SELECTs for case rows and for their sweeps, threats and notes, newest first.
 
-        # Get linked threats
-        cursor = conn.execute('''
-            SELECT t.* FROM tscm_threats t
-            JOIN tscm_case_threats ct ON t.id = ct.threat_id
-            WHERE ct.case_id = ?
+    Each statement binds the case id, or with many=True a JSON array of case
+    ids, keeping the statement text independent of how many ids are asked
+    for. Child rows lead with owner_id, the case they are linked to.
+    """
+    sweep_columns = _SWEEP_COLUMNS + (_SWEEP_PAYLOAD_COLUMNS if include_payload else ())
+    threat_columns = _THREAT_COLUMNS if include_payload else tuple(
+        col for col in _THREAT_COLUMNS if col not in _THREAT_JSON_COLUMNS
+    )
+    match = 'IN (SELECT value FROM json_each(?))' if many else '= ?'
+    return (
+        f'SELECT * FROM tscm_cases WHERE id {match}',
+        f'''
+            SELECT cs.case_id AS owner_id, {', '.join(f's.{col}' for col in sweep_columns)}
+            FROM tscm_case_sweeps cs
+            JOIN tscm_sweeps s ON s.id = cs.sweep_id
+            WHERE cs.case_id {match}
+            ORDER BY s.started_at DESC
+        ''',
+        f'''
+            SELECT ct.case_id AS owner_id, {', '.join(f't.{col}' for col in threat_columns)}
+            FROM tscm_case_threats ct
+            JOIN tscm_threats t ON t.id = ct.threat_id
+            WHERE ct.case_id {match}
             ORDER BY t.detected_at DESC
-        ''', (case_id,))
-        case['threats'] = [dict(row) for row in cursor]
-
-        # Get case notes
-        cursor = conn.execute('''
-            SELECT * FROM tscm_case_notes
-            WHERE case_id = ?
+        ''',
+        f'''
+            SELECT case_id AS owner_id, {', '.join(_CASE_NOTE_COLUMNS)}
+            FROM tscm_case_notes
+            WHERE case_id {match}
             ORDER BY created_at DESC
-        ''', (case_id,))
-        case['case_notes'] = [dict(row) for row in cursor]
+        ''',
+    )
+
+
+def _case_from_row(row: sqlite3.Row) -> dict:
+    """Build a case dict from a tscm_cases row, with empty child lists."""
+    return {
+        'id': row['id'],
+        'name': row['name'],
+        'description': row['description'],
+        'location': row['location'],
+        'status': row['status'],
+        'priority': row['priority'],
+        'created_at': row['created_at'],
+        'updated_at': row['updated_at'],
+        'closed_at': row['closed_at'],
+        'created_by': row['created_by'],
+        'assigned_to': row['assigned_to'],
+        'notes': row['notes'],
+        'metadata': _loads(row['metadata']) if row['metadata'] else None,
+        'sweeps': [],
+        'threats': [],
+        'case_notes': []
+    }
+
+
+def _read_tscm_cases(param: int | str, include_payload: bool, many: bool) -> dict[int, dict]:
+    """Read cases and their children from one snapshot, keyed by case ID."""
+    case_sql, *children_sql = _tscm_case_sql(include_payload, many)
+    with _db_read_snapshot() as conn:
+        cases = {row['id']: _case_from_row(row) for row in conn.execute(case_sql, (param,))}
+        if cases:
+            for key, sql in zip(('sweeps', 'threats', 'case_notes'), children_sql):
+                for row in conn.execute(sql, (param,)):
+                    child = dict(row)
+                    cases[child.pop('owner_id')][key].append(child)
+    return cases
+
+
+def get_tscm_case(case_id: int, include_payload: bool = True) -> dict | None:
+    """
+    Get a TSCM case by ID, with its linked sweeps, threats and notes.
+
+    Args:
+        case_id: Case to fetch
+        include_payload: Embed the sweeps' results/anomalies and the threats'
+            details/gps_coords JSON text; False leaves those columns out
+    """
+    return _read_tscm_cases(case_id, include_payload, many=False).get(case_id)
+
+
+def get_tscm_cases_with_children(
+    case_ids: list[int],
+    include_payload: bool = True
+) -> dict[int, dict]:
+    """
+    Get several TSCM cases with their linked sweeps, threats and notes.
+
+    Fetches every case with one statement per child table instead of one
+    get_tscm_case() call per case. Unknown IDs are left out of the result.
+
+    Returns:
+        Case dicts keyed by case ID
+    """
+    if not case_ids:
+        return {}
+    return _read_tscm_cases(_dumps(list(case_ids)), include_payload, many=True)
 
-        return case
+
+# Case columns listed by get_all_tscm_cases() when the payload is not wanted
+_CASE_LIST_COLUMNS = (
+    'id', 'name', 'description', 'location', 'status', 'priority', 'created_at',
+    'updated_at', 'closed_at', 'created_by', 'assigned_to', 'notes'
+)
 
 
 def get_all_tscm_cases(
     status: str | None = None,
-    limit: int = 50
+    limit: int = 50,
+    include_payload: bool = True
 ) -> list[dict]:
-    """Get all TSCM cases."""
+    """Get all TSCM cases; include_payload=False leaves out the raw metadata JSON."""
     conditions = []
     params = []
 
@@ -1564,17 +2380,14 @@ def get_all_tscm_cases(
         conditions.append('status = ?')
         params.append(status)
 
-    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
     params.append(limit)
 
-    with get_db() as conn:
-        cursor = conn.execute(f'''
-            SELECT * FROM tscm_cases
-            {where_clause}
-            ORDER BY updated_at DESC
-            LIMIT ?
-        ''', params)
-        return [dict(row) for row in cursor]
+    columns = () if include_payload else _CASE_LIST_COLUMNS
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql(
+            'tscm_cases', tuple(conditions), 'ORDER BY updated_at DESC LIMIT ?', columns
+        ), params)
+        return _rows_to_dicts(cursor)
 
 
 def update_tscm_case(
@@ -1606,45 +2419,53 @@ def update_tscm_case(
     params.append(case_id)
 
     with get_db() as conn:
-        cursor = conn.execute(
-            f'UPDATE tscm_cases SET {", ".join(updates)} WHERE id = ?',
-            params
-        )
+        cursor = conn.execute(_update_sql('tscm_cases', tuple(updates)), params)
         return cursor.rowcount > 0
 
 
+def _link_to_case(
+    link_table: str,
+    target_table: str,
+    column: str,
+    case_id: int,
+    ids: list[int]
+) -> int:
+    """
+    Link many rows of target_table to a case in a single transaction.
+
+    Pairs whose case or target does not exist are skipped by the join, and
+    existing links by OR IGNORE, so one bad id never aborts the batch.
+    Returns the number of new links.
+    """
+    if not ids:
+        return 0
+    with get_db() as conn:
+        cursor = conn.executemany(f'''
+            INSERT OR IGNORE INTO {link_table} (case_id, {column})
+            SELECT c.id, t.id FROM tscm_cases c, {target_table} t
+            WHERE c.id = ? AND t.id = ?
+        ''', [(case_id, target_id) for target_id in ids])
+        return cursor.rowcount
+
+
+def add_sweeps_to_case(case_id: int, sweep_ids: list[int]) -> int:
+    """Link many sweeps to a case; returns the number newly linked."""
+    return _link_to_case('tscm_case_sweeps', 'tscm_sweeps', 'sweep_id', case_id, sweep_ids)
+
+
+def add_threats_to_case(case_id: int, threat_ids: list[int]) -> int:
+    """Link many threats to a case; returns the number newly linked."""
+    return _link_to_case('tscm_case_threats', 'tscm_threats', 'threat_id', case_id, threat_ids)
+
+
 def add_sweep_to_case(case_id: int, sweep_id: int) -> bool:
     """Link a sweep to a case."""
-    with get_db() as conn:
-        try:
-            conn.execute('''
-                INSERT INTO tscm_case_sweeps (case_id, sweep_id)
-                VALUES (?, ?)
-            ''', (case_id, sweep_id))
-            conn.execute(
-                'UPDATE tscm_cases SET updated_at = CURRENT_TIMESTAMP WHERE id = ?',
-                (case_id,)
-            )
-            return True
-        except sqlite3.IntegrityError:
-            return False
+    return add_sweeps_to_case(case_id, [sweep_id]) > 0
 
 
 def add_threat_to_case(case_id: int, threat_id: int) -> bool:
     """Link a threat to a case."""
-    with get_db() as conn:
-        try:
-            conn.execute('''
-                INSERT INTO tscm_case_threats (case_id, threat_id)
-                VALUES (?, ?)
-            ''', (case_id, threat_id))
-            conn.execute(
-                'UPDATE tscm_cases SET updated_at = CURRENT_TIMESTAMP WHERE id = ?',
-                (case_id,)
-            )
-            return True
-        except sqlite3.IntegrityError:
-            return False
+    return add_threats_to_case(case_id, [threat_id]) > 0
 
 
 def add_case_note(
@@ -1655,15 +2476,27 @@ def add_case_note(
 ) -> int:
     """Add a note to a case."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_case_notes (case_id, content, note_type, created_by)
             VALUES (?, ?, ?, ?)
         ''', (case_id, content, note_type, created_by))
-        conn.execute(
-            'UPDATE tscm_cases SET updated_at = CURRENT_TIMESTAMP WHERE id = ?',
-            (case_id,)
-        )
-        return cursor.lastrowid
+
+
+def add_case_notes(case_id: int, notes: list[tuple[str, str, str | None]]) -> None:
+    """
+    Add many notes to a case in a single transaction.
+
+    Args:
+        case_id: Case the notes belong to
+        notes: (content, note_type, created_by) tuples
+    """
+    if not notes:
+        return
+    with get_db() as conn:
+        conn.executemany('''
+            INSERT INTO tscm_case_notes (case_id, content, note_type, created_by)
+            VALUES (?, ?, ?, ?)
+        ''', [(case_id, *note) for note in notes])
 
 
 # =============================================================================
@@ -1678,11 +2511,10 @@ def start_meeting_window(
 ) -> int:
     """Start a meeting window."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_meeting_windows (sweep_id, name, start_time, location, notes)
             VALUES (?, ?, CURRENT_TIMESTAMP, ?, ?)
         ''', (sweep_id, name, location, notes))
-        return cursor.lastrowid
 
 
 def end_meeting_window(meeting_id: int) -> bool:
@@ -1698,7 +2530,7 @@ def end_meeting_window(meeting_id: int) -> bool:
 
 def get_active_meeting_window(sweep_id: int | None = None) -> dict | None:
     """Get currently active meeting window."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         if sweep_id:
             cursor = conn.execute('''
                 SELECT * FROM tscm_meeting_windows
@@ -1719,13 +2551,13 @@ def get_active_meeting_window(sweep_id: int | None = None) -> dict | None:
 
 def get_meeting_windows(sweep_id: int) -> list[dict]:
     """Get all meeting windows for a sweep."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         cursor = conn.execute('''
             SELECT * FROM tscm_meeting_windows
             WHERE sweep_id = ?
             ORDER BY start_time
         ''', (sweep_id,))
-        return [dict(row) for row in cursor]
+        return _rows_to_dicts(cursor)
 
 
 # =============================================================================
@@ -1739,21 +2571,20 @@ def save_sweep_capabilities(
 ) -> int:
     """Save sweep capabilities snapshot."""
     with get_db() as conn:
-        cursor = conn.execute('''
+        return _insert_returning_id(conn, '''
             INSERT INTO tscm_sweep_capabilities (sweep_id, capabilities, limitations)
             VALUES (?, ?, ?)
             ON CONFLICT(sweep_id) DO UPDATE SET
                 capabilities = excluded.capabilities,
                 limitations = excluded.limitations,
                 recorded_at = CURRENT_TIMESTAMP
-        ''', (sweep_id, json.dumps(capabilities),
-              json.dumps(limitations) if limitations else None))
-        return cursor.lastrowid
+        ''', (sweep_id, _dumps(capabilities),
+              _dumps(limitations) if limitations else None))
 
 
 def get_sweep_capabilities(sweep_id: int) -> dict | None:
     """Get capabilities for a sweep."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         cursor = conn.execute(
             'SELECT * FROM tscm_sweep_capabilities WHERE sweep_id = ?',
             (sweep_id,)
@@ -1763,8 +2594,8 @@ def get_sweep_capabilities(sweep_id: int) -> dict | None:
             return None
         return {
             'sweep_id': row['sweep_id'],
-            'capabilities': json.loads(row['capabilities']),
-            'limitations': json.loads(row['limitations']) if row['limitations'] else [],
+            'capabilities': _loads(row['capabilities']),
+            'limitations': _loads(row['limitations']) if row['limitations'] else [],
             'recorded_at': row['recorded_at']
         }
 
@@ -1773,6 +2604,21 @@ def get_sweep_capabilities(sweep_id: int) -> dict | None:
 # DSC (Digital Selective Calling) Functions
 # =============================================================================
 
+# Columns of an alert record, in the order they are selected
+_DSC_ALERT_COLUMNS = (
+    'id', 'received_at', 'source_mmsi', 'source_name', 'dest_mmsi', 'format_code',
+    'category', 'nature_of_distress', 'latitude', 'longitude', 'raw_message',
+    'acknowledged', 'notes'
+)
+
+
+def _dsc_alert_from_row(row: tuple) -> dict:
+    """Build an alert dict from a row selected with _DSC_ALERT_COLUMNS."""
+    alert = dict(zip(_DSC_ALERT_COLUMNS, row))
+    alert['acknowledged'] = bool(alert['acknowledged'])
+    return alert
+
+
 def store_dsc_alert(
     source_mmsi: str,
     format_code: str,
@@ -1791,7 +2637,7 @@ def store_dsc_alert(
         The ID of the created alert
     """
     with get_db() as conn:
-        cursor = conn.execute('''
+        alert_id = _insert_returning_id(conn, '''
             INSERT INTO dsc_alerts
             (source_mmsi, source_name, dest_mmsi, format_code, category,
              nature_of_distress, latitude, longitude, raw_message)
@@ -1800,7 +2646,8 @@ def store_dsc_alert(
             source_mmsi, source_name, dest_mmsi, format_code, category,
             nature_of_distress, latitude, longitude, raw_message
         ))
-        return cursor.lastrowid
+    _invalidate_cached('dsc_alert_summary')
+    return alert_id
 
 
 def get_dsc_alerts(
@@ -1808,7 +2655,9 @@ def get_dsc_alerts(
     acknowledged: bool | None = None,
     source_mmsi: str | None = None,
     limit: int = 100,
-    offset: int = 0
+    offset: int = 0,
+    before_received_at: str | None = None,
+    before_id: int | None = None
 ) -> list[dict]:
     """
     Get DSC alerts with optional filters.
@@ -1819,10 +2668,61 @@ def get_dsc_alerts(
         source_mmsi: Filter by source MMSI
         limit: Maximum number of results
         offset: Offset for pagination
+        before_received_at: Keyset cursor; with before_id, return only alerts
+            older than the last alert of the previous page
+        before_id: ID of the last alert of the previous page
 
     Returns:
         List of DSC alert records
     """
+    sql, params = _dsc_alerts_query(
+        category, acknowledged, source_mmsi, limit, offset, before_received_at, before_id
+    )
+    with get_db_read() as conn:
+        return [_dsc_alert_from_row(row) for row in conn.execute(sql, params)]
+
+
+def get_dsc_alerts_columnar(
+    category: str | None = None,
+    acknowledged: bool | None = None,
+    source_mmsi: str | None = None,
+    limit: int = 100,
+    offset: int = 0,
+    before_received_at: str | None = None,
+    before_id: int | None = None
+) -> dict[str, list]:
+    """
+    Get DSC alerts as one list per column, for exports and analytics.
+
+    Takes the same filters as get_dsc_alerts(); the rows are transposed in
+    one pass instead of building a dict per alert.
+
+    Returns:
+        Mapping of column name to its values, in get_dsc_alerts() order
+    """
+    sql, params = _dsc_alerts_query(
+        category, acknowledged, source_mmsi, limit, offset, before_received_at, before_id
+    )
+    with get_db_read() as conn:
+        rows = conn.execute(sql, params).fetchall()
+
+    columns = dict(zip(_DSC_ALERT_COLUMNS, map(list, zip(*rows))))
+    if not columns:
+        return {column: [] for column in _DSC_ALERT_COLUMNS}
+    columns['acknowledged'] = [bool(value) for value in columns['acknowledged']]
+    return columns
+
+
+def _dsc_alerts_query(
+    category: str | None,
+    acknowledged: bool | None,
+    source_mmsi: str | None,
+    limit: int,
+    offset: int,
+    before_received_at: str | None,
+    before_id: int | None
+) -> tuple[str, list]:
+    """Build the filtered, newest-first alert SELECT and its parameters."""
     conditions = []
     params = []
 
@@ -1830,68 +2730,33 @@ def get_dsc_alerts(
         conditions.append('category = ?')
         params.append(category)
     if acknowledged is not None:
-        conditions.append('acknowledged = ?')
-        params.append(1 if acknowledged else 0)
+        conditions.append('acknowledged = 1' if acknowledged else 'acknowledged = 0')
     if source_mmsi is not None:
         conditions.append('source_mmsi = ?')
         params.append(source_mmsi)
+    if before_received_at is not None and before_id is not None:
+        conditions.append('(received_at, id) < (?, ?)')
+        params.extend([before_received_at, before_id])
 
-    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
     params.extend([limit, offset])
 
-    with get_db() as conn:
-        cursor = conn.execute(f'''
-            SELECT * FROM dsc_alerts
-            {where_clause}
-            ORDER BY received_at DESC
-            LIMIT ? OFFSET ?
-        ''', params)
-
-        results = []
-        for row in cursor:
-            results.append({
-                'id': row['id'],
-                'received_at': row['received_at'],
-                'source_mmsi': row['source_mmsi'],
-                'source_name': row['source_name'],
-                'dest_mmsi': row['dest_mmsi'],
-                'format_code': row['format_code'],
-                'category': row['category'],
-                'nature_of_distress': row['nature_of_distress'],
-                'latitude': row['latitude'],
-                'longitude': row['longitude'],
-                'raw_message': row['raw_message'],
-                'acknowledged': bool(row['acknowledged']),
-                'notes': row['notes']
-            })
-        return results
+    sql = _select_sql(
+        'dsc_alerts', tuple(conditions),
+        'ORDER BY received_at DESC, id DESC LIMIT ? OFFSET ?',
+        _DSC_ALERT_COLUMNS
+    )
+    return sql, params
 
 
 def get_dsc_alert(alert_id: int) -> dict | None:
     """Get a specific DSC alert by ID."""
-    with get_db() as conn:
+    with get_db_read() as conn:
         cursor = conn.execute(
-            'SELECT * FROM dsc_alerts WHERE id = ?',
+            _select_sql('dsc_alerts', ('id = ?',), '', _DSC_ALERT_COLUMNS),
             (alert_id,)
         )
         row = cursor.fetchone()
-        if not row:
-            return None
-        return {
-            'id': row['id'],
-            'received_at': row['received_at'],
-            'source_mmsi': row['source_mmsi'],
-            'source_name': row['source_name'],
-            'dest_mmsi': row['dest_mmsi'],
-            'format_code': row['format_code'],
-            'category': row['category'],
-            'nature_of_distress': row['nature_of_distress'],
-            'latitude': row['latitude'],
-            'longitude': row['longitude'],
-            'raw_message': row['raw_message'],
-            'acknowledged': bool(row['acknowledged']),
-            'notes': row['notes']
-        }
+        return _dsc_alert_from_row(row) if row else None
 
 
 def acknowledge_dsc_alert(alert_id: int, notes: str | None = None) -> bool:
@@ -1916,27 +2781,39 @@ def acknowledge_dsc_alert(alert_id: int, notes: str | None = None) -> bool:
                 'UPDATE dsc_alerts SET acknowledged = 1 WHERE id = ?',
                 (alert_id,)
             )
-        return cursor.rowcount > 0
+    _invalidate_cached('dsc_alert_summary')
+    return cursor.rowcount > 0
 
 
 def get_dsc_alert_summary() -> dict:
-    """Get summary counts of DSC alerts by category."""
-    with get_db() as conn:
-        cursor = conn.execute('''
-            SELECT category, COUNT(*) as count
+    """
+    Get summary counts of DSC alerts by category.
+
+    Served from the query cache for up to two seconds; alert writes through
+    this module invalidate it.
+    """
+    return dict(_cached(('dsc_alert_summary',), 2.0, _query_dsc_alert_summary))
+
+
+def _query_dsc_alert_summary() -> dict:
+    """Count unacknowledged DSC alerts per category."""
+    with get_db_read() as conn:
+        # One pivoted row read from the covering idx_dsc_alerts_unack;
+        # UPPER() folds mixed-case rows into their bucket
+        row = conn.execute('''
+            SELECT
+                COALESCE(SUM(UPPER(category) = 'DISTRESS'), 0) AS distress,
+                COALESCE(SUM(UPPER(category) = 'URGENCY'), 0) AS urgency,
+                COALESCE(SUM(UPPER(category) = 'SAFETY'), 0) AS safety,
+                COALESCE(SUM(UPPER(category) = 'ROUTINE'), 0) AS routine
             FROM dsc_alerts
             WHERE acknowledged = 0
-            GROUP BY category
-        ''')
+        ''').fetchone()
+        summary = dict(row)
 
-        summary = {'distress': 0, 'urgency': 0, 'safety': 0, 'routine': 0, 'total': 0}
-        for row in cursor:
-            cat = row['category'].lower()
-            if cat in summary:
-                summary[cat] = row['count']
-            summary['total'] += row['count']
-
-        return summary
+    # Total of the reported buckets, so it always matches what is shown
+    summary['total'] = sum(summary.values())
+    return summary
 
 
 def cleanup_old_dsc_alerts(max_age_days: int = 30) -> int:
@@ -1949,19 +2826,26 @@ def cleanup_old_dsc_alerts(max_age_days: int = 30) -> int:
     Returns:
         Number of deleted alerts
     """
-    with get_db() as conn:
-        cursor = conn.execute('''
-            DELETE FROM dsc_alerts
-            WHERE acknowledged = 1
-              AND received_at < datetime('now', ?)
-        ''', (f'-{max_age_days} days',))
-        return cursor.rowcount
+    deleted = _delete_in_batches(
+        'dsc_alerts', 'acknowledged = 1 AND received_at < ?',
+        (_timestamp_cutoff(max_age_days * 24),)
+    )
+    _invalidate_cached('dsc_alert_summary')
+    return deleted
 
 
 # =============================================================================
 # Remote Agent Functions (for distributed/controller mode)
 # =============================================================================
 
+# Columns of an agent record, in the order they are selected
+_AGENT_COLUMNS = (
+    'id', 'name', 'base_url', 'description', 'api_key', 'capabilities',
+    'interfaces', 'gps_coords', 'last_seen', 'created_at', 'is_active'
+)
+_AGENT_JSON_COLUMNS = ('capabilities', 'interfaces', 'gps_coords')
+
+
 def create_agent(
     name: str,
     base_url: str,
@@ -1978,7 +2862,7 @@ def create_agent(
         The ID of the created agent
     """
     with get_db() as conn:
-        cursor = conn.execute('''
+        agent_id = _insert_returning_id(conn, '''
             INSERT INTO agents
             (name, base_url, api_key, description, capabilities, interfaces, gps_coords)
             VALUES (?, ?, ?, ?, ?, ?, ?)
@@ -1987,59 +2871,63 @@ def create_agent(
             base_url.rstrip('/'),
             api_key,
             description,
-            json.dumps(capabilities) if capabilities else None,
-            json.dumps(interfaces) if interfaces else None,
-            json.dumps(gps_coords) if gps_coords else None
+            _dumps(capabilities) if capabilities else None,
+            _dumps(interfaces) if interfaces else None,
+            _dumps(gps_coords) if gps_coords else None
         ))
-        return cursor.lastrowid
+    _invalidate_cached('agents')
+    return agent_id
 
 
 def get_agent(agent_id: int) -> dict | None:
     """Get an agent by ID."""
-    with get_db() as conn:
-        cursor = conn.execute('SELECT * FROM agents WHERE id = ?', (agent_id,))
+    with get_db_read() as conn:
+        cursor = conn.execute(
+            _select_sql('agents', ('id = ?',), '', _AGENT_COLUMNS), (agent_id,)
+        )
         row = cursor.fetchone()
-        if not row:
-            return None
-        return _row_to_agent(row)
+        return _row_to_agent(row) if row else None
 
 
 def get_agent_by_name(name: str) -> dict | None:
     """Get an agent by name."""
-    with get_db() as conn:
-        cursor = conn.execute('SELECT * FROM agents WHERE name = ?', (name,))
+    with get_db_read() as conn:
+        cursor = conn.execute(
+            _select_sql('agents', ('name = ?',), '', _AGENT_COLUMNS), (name,)
+        )
         row = cursor.fetchone()
-        if not row:
-            return None
-        return _row_to_agent(row)
+        return _row_to_agent(row) if row else None
 
 
-def _row_to_agent(row) -> dict:
-    """Convert database row to agent dict."""
-    return {
-        'id': row['id'],
-        'name': row['name'],
-        'base_url': row['base_url'],
-        'description': row['description'],
-        'api_key': row['api_key'],
-        'capabilities': json.loads(row['capabilities']) if row['capabilities'] else None,
-        'interfaces': json.loads(row['interfaces']) if row['interfaces'] else None,
-        'gps_coords': json.loads(row['gps_coords']) if row['gps_coords'] else None,
-        'last_seen': row['last_seen'],
-        'created_at': row['created_at'],
-        'is_active': bool(row['is_active'])
-    }
+def _row_to_agent(row: tuple) -> dict:
+    """Convert a row selected with _AGENT_COLUMNS to an agent dict."""
+    agent = dict(zip(_AGENT_COLUMNS, row))
+    for column in _AGENT_JSON_COLUMNS:
+        agent[column] = _loads(agent[column]) if agent[column] else None
+    agent['is_active'] = bool(agent['is_active'])
+    return agent
 
 
 def list_agents(active_only: bool = True) -> list[dict]:
-    """Get all agents."""
-    with get_db() as conn:
-        if active_only:
-            cursor = conn.execute(
-                'SELECT * FROM agents WHERE is_active = 1 ORDER BY name'
-            )
-        else:
-            cursor = conn.execute('SELECT * FROM agents ORDER BY name')
+    """
+    Get all agents.
+
+    Served from the query cache for up to five seconds; agent writes through
+    this module invalidate it, but last_seen bumps from pushed payloads may
+    lag by up to that long. Each call returns fresh top-level dicts so callers
+    can annotate them.
+    """
+    agents = _cached(('agents', active_only), 5.0, lambda: _query_agents(active_only))
+    return [dict(agent) for agent in agents]
+
+
+def _query_agents(active_only: bool) -> list[dict]:
+    """Read agents ordered by name."""
+    with get_db_read() as conn:
+        conditions = ('is_active = 1',) if active_only else ()
+        cursor = conn.execute(
+            _select_sql('agents', conditions, 'ORDER BY name', _AGENT_COLUMNS)
+        )
         return [_row_to_agent(row) for row in cursor]
 
 
@@ -2069,13 +2957,13 @@ def update_agent(
         params.append(api_key)
     if capabilities is not None:
         updates.append('capabilities = ?')
-        params.append(json.dumps(capabilities))
+        params.append(_dumps(capabilities))
     if interfaces is not None:
         updates.append('interfaces = ?')
-        params.append(json.dumps(interfaces))
+        params.append(_dumps(interfaces))
     if gps_coords is not None:
         updates.append('gps_coords = ?')
-        params.append(json.dumps(gps_coords))
+        params.append(_dumps(gps_coords))
     if is_active is not None:
         updates.append('is_active = ?')
         params.append(1 if is_active else 0)
@@ -2088,20 +2976,17 @@ def update_agent(
     params.append(agent_id)
 
     with get_db() as conn:
-        cursor = conn.execute(
-            f'UPDATE agents SET {", ".join(updates)} WHERE id = ?',
-            params
-        )
-        return cursor.rowcount > 0
+        cursor = conn.execute(_update_sql('agents', tuple(updates)), params)
+    _invalidate_cached('agents')
+    return cursor.rowcount > 0
 
 
 def delete_agent(agent_id: int) -> bool:
-    """Delete an agent and its push payloads."""
+    """Delete an agent; its push payloads go with it via ON DELETE CASCADE."""
     with get_db() as conn:
-        # Delete push payloads first (foreign key)
-        conn.execute('DELETE FROM push_payloads WHERE agent_id = ?', (agent_id,))
         cursor = conn.execute('DELETE FROM agents WHERE id = ?', (agent_id,))
-        return cursor.rowcount > 0
+    _invalidate_cached('agents')
+    return cursor.rowcount > 0
 
 
 def store_push_payload(
@@ -2117,33 +3002,83 @@ def store_push_payload(
     Returns:
         The ID of the created payload record
     """
+    return store_push_payloads_bulk(agent_id, [(scan_type, interface, payload, received_at)])[0]
+
+
+def store_push_payloads_bulk(
+    agent_id: int,
+    items: list[tuple[str, str | None, dict, str | None]]
+) -> list[int]:
+    """
+    Store many push payloads from one agent in a single transaction.
+
+    Args:
+        agent_id: Agent the payloads came from
+        items: (scan_type, interface, payload, received_at) tuples; a None
+            received_at defaults to the current time
+
+    Returns:
+        IDs of the created payload records, in input order
+    """
     with get_db() as conn:
-        if received_at:
-            cursor = conn.execute('''
+        ids = [
+            _insert_returning_id(conn, '''
                 INSERT INTO push_payloads (agent_id, scan_type, interface, payload, received_at)
-                VALUES (?, ?, ?, ?, ?)
-            ''', (agent_id, scan_type, interface, json.dumps(payload), received_at))
-        else:
-            cursor = conn.execute('''
-                INSERT INTO push_payloads (agent_id, scan_type, interface, payload)
-                VALUES (?, ?, ?, ?)
-            ''', (agent_id, scan_type, interface, json.dumps(payload)))
+                VALUES (?, ?, ?, ?, COALESCE(?, CURRENT_TIMESTAMP))
+            ''', (agent_id, scan_type, interface, _compress_payload(payload), received_at))
+            for scan_type, interface, payload, received_at in items
+        ]
 
-        # Update agent last_seen
+        # Update agent last_seen once for the whole batch
         conn.execute(
             'UPDATE agents SET last_seen = CURRENT_TIMESTAMP WHERE id = ?',
             (agent_id,)
         )
 
-        return cursor.lastrowid
+        return ids
+
+
+# Columns for payload listings, with and without the payload body
+_PAYLOAD_META_COLUMNS = (
+    'p.id', 'p.agent_id', 'a.name AS agent_name', 'p.scan_type', 'p.interface',
+    'p.received_at', 'length(p.payload) AS payload_size'
+)
+_PAYLOAD_COLUMNS = _PAYLOAD_META_COLUMNS[:-1] + ('p.payload',)
 
 
 def get_recent_payloads(
     agent_id: int | None = None,
     scan_type: str | None = None,
-    limit: int = 100
+    limit: int = 100,
+    before_received_at: str | None = None,
+    before_id: int | None = None,
+    include_payload: bool = True
 ) -> list[dict]:
-    """Get recent push payloads, optionally filtered."""
+    """Get recent push payloads as a list; see iter_recent_payloads()."""
+    return list(iter_recent_payloads(
+        agent_id, scan_type, limit, before_received_at, before_id, include_payload
+    ))
+
+
+def iter_recent_payloads(
+    agent_id: int | None = None,
+    scan_type: str | None = None,
+    limit: int = 100,
+    before_received_at: str | None = None,
+    before_id: int | None = None,
+    include_payload: bool = True
+) -> Iterator[dict]:
+    """
+    Yield recent push payloads, newest first, optionally filtered.
+
+    Each payload is decoded only when the consumer reaches it, so streaming
+    responses never hold the whole page in memory.
+
+    Pass the received_at and id of the last payload of the previous page as
+    before_received_at/before_id to fetch the next (older) page. With
+    include_payload=False the payload bodies are neither read nor decoded;
+    each record carries the stored payload_size in bytes instead.
+    """
     conditions = []
     params = []
 
@@ -2153,39 +3088,40 @@ def get_recent_payloads(
     if scan_type is not None:
         conditions.append('p.scan_type = ?')
         params.append(scan_type)
+    if before_received_at is not None and before_id is not None:
+        conditions.append('(p.received_at, p.id) < (?, ?)')
+        params.extend([before_received_at, before_id])
 
-    where_clause = f'WHERE {" AND ".join(conditions)}' if conditions else ''
     params.append(limit)
 
-    with get_db() as conn:
-        cursor = conn.execute(f'''
-            SELECT p.*, a.name as agent_name
-            FROM push_payloads p
-            JOIN agents a ON p.agent_id = a.id
-            {where_clause}
-            ORDER BY p.received_at DESC
-            LIMIT ?
-        ''', params)
+    with get_db_read() as conn:
+        cursor = conn.execute(_select_sql(
+            'push_payloads p JOIN agents a ON p.agent_id = a.id',
+            tuple(conditions),
+            'ORDER BY p.received_at DESC, p.id DESC LIMIT ?',
+            _PAYLOAD_COLUMNS if include_payload else _PAYLOAD_META_COLUMNS
+        ), params)
 
-        results = []
         for row in cursor:
-            results.append({
+            record = {
                 'id': row['id'],
                 'agent_id': row['agent_id'],
                 'agent_name': row['agent_name'],
                 'scan_type': row['scan_type'],
                 'interface': row['interface'],
-                'payload': json.loads(row['payload']),
                 'received_at': row['received_at']
-            })
-        return results
+            }
+            if include_payload:
+                record['payload'] = _decompress_payload(row['payload'])
+            else:
+                record['payload_size'] = row['payload_size']
+            yield record
 
 
 def cleanup_old_payloads(max_age_hours: int = 24) -> int:
     """Remove old push payloads."""
-    with get_db() as conn:
-        cursor = conn.execute('''
-            DELETE FROM push_payloads
-            WHERE received_at < datetime('now', ?)
-        ''', (f'-{max_age_hours} hours',))
-        return cursor.rowcount
+    # Payload rows carry whole scan results, so use smaller batches
+    return _delete_in_batches(
+        'push_payloads', 'received_at < ?', (_timestamp_cutoff(max_age_hours),),
+        batch_size=500
+    )
@@ -4,6 +4,7 @@ import logging
 import os
 import shutil
 import subprocess
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any
 
 logger = logging.getLogger('intercept.dependencies')
@@ -11,6 +12,9 @@ logger = logging.getLogger('intercept.dependencies')
 # Additional paths to search for tools (e.g., /usr/sbin on Debian)
 EXTRA_TOOL_PATHS = ['/usr/sbin', '/sbin']
 
+# Threads used by check_all_dependencies() to probe tools in parallel
+_PROBE_WORKERS = 8
+
 
 def check_tool(name: str) -> bool:
     """Check if a tool is installed."""
@@ -74,28 +78,31 @@ def _get_soapy_env() -> dict[str, str]:
     return env
 
 
-def check_soapy_factory(factory_name: str) -> bool:
-    """Check if a SoapySDR factory/module is available using SoapySDRUtil."""
+def _get_soapy_factories() -> set[str]:
+    """Get the SoapySDR factories/modules reported by SoapySDRUtil."""
     try:
-        # Run SoapySDRUtil --info and look for the factory in 'Available factories'
+        # Run SoapySDRUtil --info and look for 'Available factories'
         # Use macOS-aware environment to find Homebrew-installed modules
         env = _get_soapy_env()
         result = subprocess.run(['SoapySDRUtil', '--info'], capture_output=True, text=True, env=env)
         if result.returncode != 0:
-            return False
+            return set()
 
         # Parse output for available factories
         # Format usually: "Available factories... hackrf, lime, rtlsdr"
         for line in result.stdout.splitlines():
             if "Available factories" in line:
                 factories = line.split("...")[-1].strip().split(",")
-                factories = [f.strip() for f in factories]
-                if factory_name in factories:
-                    return True
-        return False
+                return {f.strip() for f in factories}
+        return set()
     except Exception as e:
-        logger.debug(f"Failed to check SoapySDR factory {factory_name}: {e}")
-        return False
+        logger.debug(f"Failed to list SoapySDR factories: {e}")
+        return set()
+
+
+def check_soapy_factory(factory_name: str) -> bool:
+    """Check if a SoapySDR factory/module is available using SoapySDRUtil."""
+    return factory_name in _get_soapy_factories()
 
 
 # Comprehensive tool dependency definitions
@@ -483,6 +490,28 @@ def check_all_dependencies() -> dict[str, dict[str, Any]]:
     """Check all tool dependencies and return status."""
     results: dict[str, dict[str, Any]] = {}
 
+    # Several modes share tools (rtl_fm, multimon-ng, ...), so probe each
+    # binary once per call, and run SoapySDRUtil at most once. The probes are
+    # independent filesystem lookups, so they run in parallel alongside the
+    # SoapySDRUtil process. Nothing is kept between calls, so tools installed
+    # while running are picked up.
+    binaries: dict[str, None] = {}
+    needs_soapy = False
+    for config in TOOL_DEPENDENCIES.values():
+        for tool, tool_config in config['tools'].items():
+            if tool_config.get('python_module'):
+                continue
+            if tool_config.get('soapy_factory'):
+                needs_soapy = True
+                continue
+            binaries[tool] = None
+            binaries.update(dict.fromkeys(tool_config.get('alternatives', [])))
+
+    with ThreadPoolExecutor(max_workers=_PROBE_WORKERS) as executor:
+        soapy_future = executor.submit(_get_soapy_factories) if needs_soapy else None
+        installed_tools = dict(zip(binaries, executor.map(check_tool, binaries)))
+        soapy_factories = soapy_future.result() if soapy_future else set()
+
     for mode, config in TOOL_DEPENDENCIES.items():
         mode_result = {
             'name': config['name'],
@@ -502,11 +531,11 @@ def check_all_dependencies() -> dict[str, dict[str, Any]]:
                     installed = False
             # Check using SoapySDRUtil if specified
             elif tool_config.get('soapy_factory'):
-                installed = check_soapy_factory(tool_config['soapy_factory'])
+                installed = tool_config['soapy_factory'] in soapy_factories
             else:
                 # Check for alternatives
                 alternatives = tool_config.get('alternatives', [])
-                installed = check_tool(tool) or any(check_tool(alt) for alt in alternatives)
+                installed = installed_tools[tool] or any(installed_tools[alt] for alt in alternatives)
 
             mode_result['tools'][tool] = {
                 'installed': installed,